@@ -5,16 +5,25 @@
 
 import asyncio
 import logging
+from types import MappingProxyType
 from typing import Dict, Any, List, Optional
-from fastapi import APIRouter, HTTPException, Body, Query
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from lib.container_management_service import container_service, ContainerConfig
 
 # Setup logging
 logger = logging.getLogger("production_agent")
 
+# Environment every production agent container gets
+_BASE_ENV = MappingProxyType({"GENESIS_MODE": "production"})
+
 # Create router
-router = APIRouter(prefix="/api/production-agents", tags=["production-agents"])
+router = APIRouter(
+    prefix="/api/production-agents",
+    tags=["production-agents"],
+    default_response_class=ORJSONResponse
+)
 
 class ProductionAgentRequest(BaseModel):
     agent_id: str
@@ -40,32 +49,39 @@ async def create_production_agent(request: ProductionAgentRequest):
         logger.info(f"🚀 Creating production agent: {request.agent_id}")
         
         # Create container config
+        environment = dict(request.environment)
+        environment.update(_BASE_ENV)
+        environment["AGENT_ID"] = request.agent_id
+        
         config = ContainerConfig(
             image=request.image,
-            environment={
-                **request.environment,
-                "AGENT_ID": request.agent_id,
-                "GENESIS_MODE": "production"
-            },
+            environment=environment,
             resources=request.resources,
             capabilities=request.capabilities,
             networks=request.networks
         )
         
-        # Create container
-        container_id = await container_service.create_agent_container(
-            request.agent_id, 
+        # Claim a pre-started container from the warm pool when possible
+        container_id = await container_service.claim_warm_container(
+            request.agent_id,
             config
         )
         
-        # Start container
-        started = await container_service.start_container(container_id)
-        
-        if not started:
-            raise HTTPException(
-                status_code=500, 
-                detail=f"Failed to start container {container_id}"
+        if not container_id:
+            # Create container
+            container_id = await container_service.create_agent_container(
+                request.agent_id, 
+                config
             )
+            
+            # Start container
+            started = await container_service.start_container(container_id)
+            
+            if not started:
+                raise HTTPException(
+                    status_code=500, 
+                    detail=f"Failed to start container {container_id}"
+                )
         
         logger.info(f"✅ Production agent created: {request.agent_id}")
         
@@ -82,20 +98,86 @@ async def create_production_agent(request: ProductionAgentRequest):
         logger.error(f"❌ Failed to create production agent {request.agent_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Task handlers - each takes the task request and the agent's container id
+
+async def _run_command(request: TaskRequest, container_id: str) -> Dict[str, Any]:
+    command = request.parameters.get("command")
+    if not command:
+        raise HTTPException(status_code=400, detail="Command parameter required")
+    
+    return await container_service.execute_command(
+        container_id, 
+        [command] if isinstance(command, str) else command
+    )
+
+async def _read_file(request: TaskRequest, container_id: str) -> Dict[str, Any]:
+    filepath = request.parameters.get("filepath")
+    return await container_service.execute_command(
+        container_id, 
+        ["cat", filepath]
+    )
+
+async def _write_file(request: TaskRequest, container_id: str) -> Dict[str, Any]:
+    filepath = request.parameters.get("filepath")
+    if not filepath:
+        raise HTTPException(status_code=400, detail="Filepath parameter required")
+    
+    content = request.parameters.get("content", "")
+    return await container_service.write_file(
+        container_id,
+        filepath,
+        content.encode('utf-8') if isinstance(content, str) else content
+    )
+
+async def _list_directory(request: TaskRequest, container_id: str) -> Dict[str, Any]:
+    directory = request.parameters.get("directory", "/workspace")
+    return await container_service.execute_command(
+        container_id,
+        ["ls", "-la", directory]
+    )
+
+_FILE_OPERATIONS = {
+    "read": _read_file,
+    "write": _write_file,
+    "list": _list_directory
+}
+
+async def _file_operation(request: TaskRequest, container_id: str) -> Dict[str, Any]:
+    operation = request.parameters.get("operation")
+    handler = _FILE_OPERATIONS.get(operation)
+    if not handler:
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Unsupported file operation: {operation}"
+        )
+    
+    return await handler(request, container_id)
+
+async def _browser_task(request: TaskRequest, container_id: str) -> Dict[str, Any]:
+    # Browser tasks - would need Playwright integration
+    # For now, simulate these tasks
+    return {
+        "stdout": f"Browser task '{request.task_type}' executed successfully",
+        "stderr": "",
+        "exitCode": 0
+    }
+
+_BROWSER_TASKS = frozenset(("navigation", "click", "type"))
+
+_TASK_HANDLERS = {
+    "command": _run_command,
+    "file_operation": _file_operation,
+    **{task_type: _browser_task for task_type in _BROWSER_TASKS}
+}
+
 @router.post("/execute-task")
 async def execute_task(request: TaskRequest):
     """Execute a task on a production agent"""
     try:
         logger.info(f"🎯 Executing task {request.task_type} on agent {request.agent_id}")
         
-        # Get all containers to find the agent
-        containers = container_service.get_all_containers()
-        agent_container = None
-        
-        for container in containers:
-            if container.get('agent_id') == request.agent_id:
-                agent_container = container
-                break
+        # Look up the agent's container via the agent index
+        agent_container = container_service.get_agent_container(request.agent_id)
         
         if not agent_container:
             raise HTTPException(
@@ -112,61 +194,15 @@ async def execute_task(request: TaskRequest):
         container_id = agent_container['container_id']
         
         # Route task based on type
-        result = None
-        
-        if request.task_type == "command":
-            command = request.parameters.get("command")
-            if not command:
-                raise HTTPException(status_code=400, detail="Command parameter required")
-            
-            result = await container_service.execute_command(
-                container_id, 
-                [command] if isinstance(command, str) else command
-            )
-            
-        elif request.task_type == "file_operation":
-            operation = request.parameters.get("operation")
-            
-            if operation == "read":
-                filepath = request.parameters.get("filepath")
-                result = await container_service.execute_command(
-                    container_id, 
-                    ["cat", filepath]
-                )
-            elif operation == "write":
-                filepath = request.parameters.get("filepath")
-                content = request.parameters.get("content", "")
-                result = await container_service.execute_command(
-                    container_id,
-                    ["sh", "-c", f"echo '{content}' > {filepath}"]
-                )
-            elif operation == "list":
-                directory = request.parameters.get("directory", "/workspace")
-                result = await container_service.execute_command(
-                    container_id,
-                    ["ls", "-la", directory]
-                )
-            else:
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Unsupported file operation: {operation}"
-                )
-                
-        elif request.task_type in ["navigation", "click", "type"]:
-            # Browser tasks - would need Playwright integration
-            # For now, simulate these tasks
-            result = {
-                "stdout": f"Browser task '{request.task_type}' executed successfully",
-                "stderr": "",
-                "exitCode": 0
-            }
-            
-        else:
+        handler = _TASK_HANDLERS.get(request.task_type)
+        if not handler:
             raise HTTPException(
                 status_code=400, 
                 detail=f"Unsupported task type: {request.task_type}"
             )
         
+        result = await handler(request, container_id)
+        
         logger.info(f"✅ Task {request.task_type} completed on agent {request.agent_id}")
         
         return {
@@ -187,28 +223,27 @@ async def execute_task(request: TaskRequest):
 async def get_agent_status(agent_id: str):
     """Get status of a production agent"""
     try:
-        containers = container_service.get_all_containers()
+        container = container_service.get_agent_container(agent_id)
         
-        for container in containers:
-            if container.get('agent_id') == agent_id:
-                # Get detailed container status
-                container_status = await container_service.get_container_status(
-                    container['container_id']
-                )
-                
-                return {
-                    "success": True,
-                    "agent_id": agent_id,
-                    "container_id": container['container_id'],
-                    "status": container['status'],
-                    "created_at": container.get('created_at'),
-                    "started_at": container.get('started_at'),
-                    "uptime": container_status.get('uptime') if container_status else 0,
-                    "health": container_status.get('health') if container_status else 'unknown',
-                    "stats": container_status.get('stats') if container_status else {}
-                }
+        if not container:
+            raise HTTPException(status_code=404, detail=f"Agent {agent_id} not found")
         
-        raise HTTPException(status_code=404, detail=f"Agent {agent_id} not found")
+        # Get detailed container status
+        container_status = await container_service.get_container_status(
+            container['container_id']
+        )
+        
+        return {
+            "success": True,
+            "agent_id": agent_id,
+            "container_id": container['container_id'],
+            "status": container['status'],
+            "created_at": container.get('created_at'),
+            "started_at": container.get('started_at'),
+            "uptime": container_status.get('uptime') if container_status else 0,
+            "health": container_status.get('health') if container_status else 'unknown',
+            "stats": container_status.get('stats') if container_status else {}
+        }
         
     except HTTPException:
         raise
@@ -216,44 +251,27 @@ async def get_agent_status(agent_id: str):
         logger.error(f"❌ Failed to get agent status {agent_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.delete("/{agent_id}")
+@router.delete("/{agent_id}", status_code=202)
 async def stop_agent(agent_id: str):
-    """Stop and remove a production agent"""
+    """Queue a production agent to be stopped and removed"""
     try:
         logger.info(f"🛑 Stopping production agent: {agent_id}")
         
-        containers = container_service.get_all_containers()
-        agent_container = None
+        container_id = container_service.queue_teardown(agent_id)
         
-        for container in containers:
-            if container.get('agent_id') == agent_id:
-                agent_container = container
-                break
-        
-        if not agent_container:
+        if not container_id:
             raise HTTPException(
                 status_code=404, 
                 detail=f"Agent {agent_id} not found"
             )
         
-        container_id = agent_container['container_id']
-        
-        # Stop and remove container
-        stopped = await container_service.stop_container(container_id)
-        removed = await container_service.remove_container(container_id)
-        
-        if not stopped or not removed:
-            raise HTTPException(
-                status_code=500, 
-                detail=f"Failed to stop/remove agent {agent_id}"
-            )
-        
-        logger.info(f"✅ Production agent stopped: {agent_id}")
-        
         return {
             "success": True,
             "agent_id": agent_id,
-            "message": f"Agent {agent_id} stopped and removed successfully"
+            "container_id": container_id,
+            "status": "queued",
+            "message": f"Agent {agent_id} queued for stop and removal",
+            "check_status_url": f"{router.prefix}/{agent_id}/teardown-status"
         }
         
     except HTTPException:
@@ -262,22 +280,28 @@ async def stop_agent(agent_id: str):
         logger.error(f"❌ Failed to stop agent {agent_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/{agent_id}/teardown-status")
+async def get_teardown_status(agent_id: str):
+    """Get status of a queued agent teardown"""
+    result = container_service.get_teardown_status(agent_id)
+    
+    if not result:
+        raise HTTPException(status_code=404, detail=f"No teardown queued for agent {agent_id}")
+    
+    return {
+        "success": True,
+        "agent_id": agent_id,
+        "container_id": result["container_id"],
+        "status": result["status"],
+        "timestamp": result["timestamp"],
+        "completed": result["status"] in ("completed", "failed")
+    }
+
 @router.get("/")
 async def list_agents():
     """List all production agents"""
     try:
-        containers = container_service.get_all_containers()
-        
-        agents = []
-        for container in containers:
-            agent_data = {
-                "agent_id": container.get('agent_id'),
-                "container_id": container['container_id'],
-                "status": container['status'],
-                "created_at": container.get('created_at'),
-                "started_at": container.get('started_at')
-            }
-            agents.append(agent_data)
+        agents = container_service.get_container_summaries()
         
         return {
             "success": True,
@@ -289,17 +313,18 @@ async def list_agents():
         logger.error(f"❌ Failed to list agents: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/cleanup")
+@router.post("/cleanup", status_code=202)
 async def cleanup_all_agents():
     """Cleanup all production agents (development only)"""
     try:
         logger.info("🧹 Cleaning up all production agents...")
         
-        await container_service.cleanup_all_containers()
+        queued = container_service.queue_teardown_all()
         
         return {
             "success": True,
-            "message": "All production agents cleaned up successfully"
+            "queued": queued,
+            "message": f"{queued} production agents queued for cleanup"
         }
         
     except Exception as e:
@@ -2,10 +2,17 @@
 Queue Status Endpoints - Monitor request queue and processing status
 """
 
+import orjson
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 from lib.request_queue_service import request_queue_service
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+async def request_event_stream(request_id: str):
+    """Encode request status updates as Server-Sent Events"""
+    async for event in request_queue_service.subscribe(request_id):
+        yield b"data: " + orjson.dumps(event) + b"\n\n"
 
 @router.get("/queue-status")
 async def get_queue_status():
@@ -35,4 +42,4 @@ async def get_request_status(request_id: str):
             "request_id": request_id,
             "status": "processing",
             "has_result": False
-        }
\ No newline at end of file
+        }
@@ -1,20 +1,43 @@
 """
 Phase 3: Advanced Multi-Agent Orchestration Service
 Handles complex multi-agent interactions, collaborative problem-solving, and emergent behaviors
+
+The orchestrator is coroutine-heavy and expects to run on uvloop. The agent
+service entrypoints (run.py, main.py) start uvicorn with --loop uvloop; any
+other entrypoint should call uvloop.install() before creating its event loop.
+This module deliberately does not install a loop policy itself.
 """
 
 import asyncio
 import json
+import os
+import random
 import time
 import uuid
 import logging
-from typing import Dict, List, Any, Optional, Set
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
-from enum import Enum
+import math
+from collections import Counter, deque
+from itertools import combinations, islice
+import numpy as np
+from typing import Callable, Deque, Dict, List, Any, Optional, Set
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from enum import Enum, IntEnum
 
 logger = logging.getLogger("advanced_multi_agent_orchestrator")
 
+# Personality traits mirrored into the orchestrator's trait array (column order)
+TRAIT_COLUMNS = ("cooperative", "analytical", "creative", "assertive", "adaptable")
+TRAIT_INDEX = {trait: col for col, trait in enumerate(TRAIT_COLUMNS)}
+
+# Initial row/column capacity of the agent arrays (doubled on demand)
+INITIAL_AGENT_CAPACITY = 64
+INITIAL_EXPERTISE_CAPACITY = 64
+
+# Interactions retained in the history ring buffer
+MAX_INTERACTION_HISTORY = 10000
+DEFAULT_TASK_DEADLINE = 24 * 3600  # seconds
+
 class AgentState(Enum):
     IDLE = "idle"
     THINKING = "thinking"
@@ -23,15 +46,16 @@ class AgentState(Enum):
     LEARNING = "learning"
     COLLABORATING = "collaborating"
 
-class InteractionType(Enum):
-    COLLABORATION = "collaboration"
-    NEGOTIATION = "negotiation"
-    KNOWLEDGE_SHARING = "knowledge_sharing"
-    CONFLICT_RESOLUTION = "conflict_resolution"
-    DELEGATION = "delegation"
-    CONSENSUS_BUILDING = "consensus_building"
+class InteractionType(IntEnum):
+    # Values double as bit positions in diversity masks
+    COLLABORATION = 0
+    NEGOTIATION = 1
+    KNOWLEDGE_SHARING = 2
+    CONFLICT_RESOLUTION = 3
+    DELEGATION = 4
+    CONSENSUS_BUILDING = 5
 
-@dataclass
+@dataclass(slots=True)
 class AgentProfile:
     id: str
     name: str
@@ -40,20 +64,19 @@ class AgentProfile:
     personality_traits: Dict[str, float]  # e.g., {"cooperative": 0.8, "analytical": 0.9}
     learning_style: str
     communication_style: str
-    trust_network: Dict[str, float]  # agent_id -> trust_level
     performance_history: List[Dict[str, Any]]
     current_state: AgentState = AgentState.IDLE
     current_workload: float = 0.0
     available_capacity: float = 1.0
 
-@dataclass
+@dataclass(slots=True)
 class CollaborativeTask:
     id: str
     name: str
     description: str
     complexity: float  # 0.0 to 1.0
     required_expertise: List[str]
-    deadline: datetime
+    deadline: float  # epoch seconds
     priority: float
     subtasks: List[Dict[str, Any]]
     dependencies: List[str]
@@ -61,10 +84,10 @@ class CollaborativeTask:
     status: str = "pending"
     progress: float = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class AgentInteraction:
     id: str
-    timestamp: datetime
+    timestamp: int  # time.monotonic_ns()
     initiator_id: str
     recipient_id: str
     interaction_type: InteractionType
@@ -73,6 +96,22 @@ class AgentInteraction:
     outcome: Optional[str] = None
     effectiveness_score: Optional[float] = None
 
+# Interactions that count towards an agent's emergent leadership
+LEADERSHIP_INTERACTIONS = frozenset({InteractionType.DELEGATION, InteractionType.CONFLICT_RESOLUTION})
+
+@dataclass(slots=True)
+class TaskCollaborationStats:
+    """Running aggregates over one task's interactions"""
+    team: frozenset
+    # Interactions between team members
+    effectiveness_sum: float = 0.0
+    interaction_count: int = 0
+    type_mask: int = 0
+    # All interactions tagged with the task
+    total_count: int = 0
+    knowledge_sharing_count: int = 0
+    leadership_scores: Counter = field(default_factory=Counter)
+
 class AdvancedMultiAgentOrchestrator:
     """
     Advanced orchestrator for complex multi-agent scenarios
@@ -84,14 +123,40 @@ class AdvancedMultiAgentOrchestrator:
     - Performance optimization
     """
     
-    def __init__(self):
+    def __init__(self, simulate_latency: bool = False, prune_ratio: float = 0.5):
+        # Sleep through each phase to mimic real work (demos only)
+        self.simulate_latency = simulate_latency
+        # Minimum fraction of a task's required expertise a candidate must cover to be scored (0 disables)
+        self.prune_ratio = prune_ratio
         self.agents: Dict[str, AgentProfile] = {}
         self.active_tasks: Dict[str, CollaborativeTask] = {}
-        self.interaction_history: List[AgentInteraction] = []
+        # Interactions are returned to callers, so evicted ones must not be recycled
+        # into new interactions
+        self.interaction_history: Deque[AgentInteraction] = deque(maxlen=MAX_INTERACTION_HISTORY)
+        self.total_interactions = 0
+        self._task_stats: Dict[str, TaskCollaborationStats] = {}
         self.knowledge_graph: Dict[str, Set[str]] = {}  # expertise -> set of agent_ids
         self.performance_metrics: Dict[str, Dict[str, float]] = {}
         self.emergent_behaviors: List[Dict[str, Any]] = []
         
+        # Structure-of-arrays mirror of agent state used for vectorized scoring
+        self._agent_row: Dict[str, int] = {}  # agent_id -> row
+        self._row_agent: List[str] = []  # row -> agent_id
+        self._expertise_index: Dict[str, int] = {}  # expertise -> column
+        self._expertise = np.zeros((INITIAL_AGENT_CAPACITY, INITIAL_EXPERTISE_CAPACITY), dtype=bool)
+        self._expertise_masks: Dict[str, int] = {}  # agent_id -> expertise bitset (bit = column)
+        self._required_masks: Dict[str, tuple] = {}  # task_id -> (required bitset, required count)
+        self._traits = np.full((INITIAL_AGENT_CAPACITY, len(TRAIT_COLUMNS)), 0.5, dtype=np.float32)
+        self._capacity = np.zeros(INITIAL_AGENT_CAPACITY, dtype=np.float32)
+        self._completion_rate = np.zeros(INITIAL_AGENT_CAPACITY, dtype=np.float32)
+        
+        # Pairwise trust, trust[i, j] = how much row i trusts row j (neutral 0.5 until set)
+        self._trust = np.full((INITIAL_AGENT_CAPACITY, INITIAL_AGENT_CAPACITY), 0.5, dtype=np.float32)
+        self._trust_known = np.zeros((INITIAL_AGENT_CAPACITY, INITIAL_AGENT_CAPACITY), dtype=bool)
+        
+        # Userspace RNG for interaction ids, seeded once instead of reading urandom per id
+        self._id_rng = random.Random(os.urandom(16))
+        
         logger.info("🤖 Advanced Multi-Agent Orchestrator initialized")
 
     async def register_agent(self, agent_data: Dict[str, Any]) -> str:
@@ -113,11 +178,11 @@ class AdvancedMultiAgentOrchestrator:
             }),
             learning_style=agent_data.get("learning_style", "collaborative"),
             communication_style=agent_data.get("communication_style", "direct"),
-            trust_network={},
             performance_history=[]
         )
         
         self.agents[agent_id] = agent_profile
+        self._index_agent(agent_profile)
         
         # Update knowledge graph
         for expertise in agent_profile.expertise:
@@ -137,6 +202,109 @@ class AdvancedMultiAgentOrchestrator:
         logger.info(f"✅ Agent {agent_id} registered with expertise: {agent_profile.expertise}")
         return agent_id
 
+    def _index_agent(self, agent: AgentProfile):
+        """Mirror an agent's expertise, traits and capacity into the agent arrays"""
+        row = self._agent_row.get(agent.id)
+        if row is None:
+            row = len(self._row_agent)
+            self._agent_row[agent.id] = row
+            self._row_agent.append(agent.id)
+            self._grow_arrays(rows=row + 1)
+        
+        self._expertise[row] = False
+        mask = 0
+        for expertise in agent.expertise:
+            col = self._expertise_column(expertise)
+            self._expertise[row, col] = True
+            mask |= 1 << col
+        self._expertise_masks[agent.id] = mask
+        
+        for trait, col in TRAIT_INDEX.items():
+            self._traits[row, col] = agent.personality_traits.get(trait, 0.5)
+        
+        self._capacity[row] = agent.available_capacity
+        self._completion_rate[row] = 0.0
+
+    def _expertise_mask(self, expertise: List[str]) -> int:
+        """Bitset of expertise columns, assigning new columns as needed"""
+        mask = 0
+        for item in expertise:
+            mask |= 1 << self._expertise_column(item)
+        return mask
+
+    def _expertise_column(self, expertise: str) -> int:
+        col = self._expertise_index.get(expertise)
+        if col is None:
+            col = len(self._expertise_index)
+            self._expertise_index[expertise] = col
+            self._grow_arrays(cols=col + 1)
+        return col
+
+    def _grow_arrays(self, rows: int = 0, cols: int = 0):
+        """Double array capacity until it holds the requested rows/columns"""
+        row_cap, col_cap = self._expertise.shape
+        new_row_cap, new_col_cap = row_cap, col_cap
+        while new_row_cap < rows:
+            new_row_cap *= 2
+        while new_col_cap < cols:
+            new_col_cap *= 2
+        if (new_row_cap, new_col_cap) == (row_cap, col_cap):
+            return
+        
+        expertise = np.zeros((new_row_cap, new_col_cap), dtype=bool)
+        expertise[:row_cap, :col_cap] = self._expertise
+        self._expertise = expertise
+        
+        if new_row_cap != row_cap:
+            traits = np.full((new_row_cap, len(TRAIT_COLUMNS)), 0.5, dtype=np.float32)
+            traits[:row_cap] = self._traits
+            self._traits = traits
+            self._capacity = np.resize(self._capacity, new_row_cap)
+            self._completion_rate = np.resize(self._completion_rate, new_row_cap)
+            
+            trust = np.full((new_row_cap, new_row_cap), 0.5, dtype=np.float32)
+            trust[:row_cap, :row_cap] = self._trust
+            self._trust = trust
+            trust_known = np.zeros((new_row_cap, new_row_cap), dtype=bool)
+            trust_known[:row_cap, :row_cap] = self._trust_known
+            self._trust_known = trust_known
+
+    def _record_interactions(self, interactions: List[AgentInteraction]):
+        """Append interactions to the history ring buffer and fold them into their task's stats"""
+        self.interaction_history.extend(interactions)
+        self.total_interactions += len(interactions)
+        for interaction in interactions:
+            stats = self._task_stats.get(interaction.context.get("task_id"))
+            if not stats:
+                continue
+            
+            # Fold the interaction into the task's running aggregates
+            interaction_type = interaction.interaction_type
+            stats.total_count += 1
+            if interaction_type in LEADERSHIP_INTERACTIONS:
+                stats.leadership_scores[interaction.initiator_id] += 1
+            elif interaction_type is InteractionType.KNOWLEDGE_SHARING:
+                stats.knowledge_sharing_count += 1
+            
+            if interaction.initiator_id in stats.team and interaction.recipient_id in stats.team:
+                stats.effectiveness_sum += interaction.effectiveness_score or 0.5
+                stats.interaction_count += 1
+                stats.type_mask |= 1 << interaction_type
+
+    def _recent_interactions(self, count: int) -> List[AgentInteraction]:
+        """Get up to `count` of the most recent interactions, newest first"""
+        return list(islice(reversed(self.interaction_history), count))
+
+    def _next_id(self, prefix: str) -> str:
+        """Generate a short interaction id (not globally unique, unlike agent/task ids)"""
+        return f"{prefix}_{self._id_rng.getrandbits(32):08x}"
+
+    def _sync_agent_load(self, agent: AgentProfile):
+        """Refresh the mirrored capacity and completion rate of an agent"""
+        row = self._agent_row[agent.id]
+        self._capacity[row] = agent.available_capacity
+        self._completion_rate[row] = self.performance_metrics[agent.id]["task_completion_rate"]
+
     async def create_collaborative_task(self, task_data: Dict[str, Any]) -> str:
         """Create a complex collaborative task requiring multiple agents"""
         task_id = task_data.get("id", f"task_{uuid.uuid4().hex[:8]}")
@@ -152,14 +320,18 @@ class AdvancedMultiAgentOrchestrator:
             description=task_data.get("description", ""),
             complexity=complexity,
             required_expertise=required_expertise,
-            deadline=datetime.fromisoformat(task_data.get("deadline", 
-                (datetime.now() + timedelta(hours=24)).isoformat())),
+            deadline=(datetime.fromisoformat(task_data["deadline"]).timestamp()
+                if task_data.get("deadline") else time.time() + DEFAULT_TASK_DEADLINE),
             priority=task_data.get("priority", 0.5),
             subtasks=task_data.get("subtasks", []),
             dependencies=task_data.get("dependencies", []),
             assigned_agents=[]
         )
         
+        self._required_masks[task_id] = (
+            self._expertise_mask(required_expertise), max(len(required_expertise), 1)
+        )
+        
         # Optimal team formation
         optimal_team = await self._form_optimal_team(task)
         task.assigned_agents = [agent.id for agent in optimal_team]
@@ -174,38 +346,52 @@ class AdvancedMultiAgentOrchestrator:
         return task_id
 
     async def _form_optimal_team(self, task: CollaborativeTask) -> List[AgentProfile]:
+        """Form optimal team off the event loop (scoring is CPU-bound numpy work)"""
+        return await asyncio.to_thread(self._form_optimal_team_sync, task)
+
+    def _form_optimal_team_sync(self, task: CollaborativeTask) -> List[AgentProfile]:
         """Form optimal team based on expertise, personality, and past performance"""
         
-        # Find agents with required expertise
-        candidate_agents = []
-        for expertise in task.required_expertise:
-            if expertise in self.knowledge_graph:
-                for agent_id in self.knowledge_graph[expertise]:
-                    agent = self.agents.get(agent_id)
-                    if agent and agent.available_capacity > 0.2:  # Agent has capacity
-                        candidate_agents.append(agent)
+        # Only read shared state here: agents registered meanwhile are simply not considered
+        n = len(self._row_agent)
         
-        if not candidate_agents:
+        # Find agents with required expertise and capacity
+        has_capacity = self._capacity[:n] > 0.2
+        required_cols = np.array(
+            [self._expertise_index[e] for e in task.required_expertise if e in self._expertise_index],
+            dtype=np.intp,
+        )
+        expertise_counts = self._expertise[:n, required_cols].sum(axis=1)
+        candidate_mask = (expertise_counts > 0) & has_capacity
+        
+        fallback = not candidate_mask.any()
+        if fallback:
             # Fallback: select agents with highest adaptability
-            candidate_agents = [
-                agent for agent in self.agents.values()
-                if agent.available_capacity > 0.2
-            ]
+            candidate_mask = has_capacity
         
-        # Score agents based on multiple factors
-        agent_scores = {}
-        for agent in candidate_agents:
-            score = self._calculate_agent_fitness_score(agent, task)
-            agent_scores[agent.id] = score
+        rows = np.flatnonzero(candidate_mask)
         
         # Select optimal team size (2-5 agents based on complexity)
-        team_size = min(max(2, int(task.complexity * 5)), len(candidate_agents))
+        team_size = min(max(2, int(task.complexity * 5)), len(rows))
+        
+        # Greedy pruning: only score candidates covering enough of the required expertise,
+        # unless that would leave too few to fill the team
+        if self.prune_ratio > 0 and not fallback:
+            keep = expertise_counts[rows] >= math.ceil(self.prune_ratio * len(required_cols))
+            if np.count_nonzero(keep) >= team_size:
+                rows = rows[keep]
+        
+        # Score the remaining candidates in one vectorized pass
+        scores = self._build_scorer(task, required_cols)(rows)
         
         # Select top-scoring agents
-        selected_agent_ids = sorted(agent_scores.items(), 
-                                   key=lambda x: x[1], reverse=True)[:team_size]
+        if team_size < len(rows):
+            top = np.argpartition(-scores, team_size - 1)[:team_size]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(-scores[top], kind="stable")]
         
-        selected_agents = [self.agents[agent_id] for agent_id, _ in selected_agent_ids]
+        selected_agents = [self.agents[self._row_agent[row]] for row in rows[top]]
         
         # Check for personality compatibility
         if len(selected_agents) > 1:
@@ -214,38 +400,26 @@ class AdvancedMultiAgentOrchestrator:
         logger.info(f"🎯 Formed optimal team of {len(selected_agents)} agents")
         return selected_agents
 
-    def _calculate_agent_fitness_score(self, agent: AgentProfile, task: CollaborativeTask) -> float:
-        """Calculate how well an agent fits a specific task"""
-        
-        # Expertise match score
-        expertise_score = 0.0
-        for expertise in task.required_expertise:
-            if expertise in agent.expertise:
-                expertise_score += 1.0
-        expertise_score = expertise_score / max(len(task.required_expertise), 1)
-        
-        # Performance history score
-        performance_score = self.performance_metrics.get(agent.id, {}).get("task_completion_rate", 0.5)
-        
-        # Availability score
-        availability_score = agent.available_capacity
-        
-        # Personality match for task complexity
-        personality_score = 0.0
-        if task.complexity > 0.7:  # Complex tasks need analytical agents
-            personality_score = agent.personality_traits.get("analytical", 0.5)
-        else:  # Simple tasks need cooperative agents
-            personality_score = agent.personality_traits.get("cooperative", 0.5)
-        
-        # Weighted final score
-        final_score = (
-            expertise_score * 0.4 +
-            performance_score * 0.3 +
-            availability_score * 0.2 +
-            personality_score * 0.1
+    def _build_scorer(self, task: CollaborativeTask, required_cols: np.ndarray) -> Callable[[np.ndarray], np.ndarray]:
+        """Specialize the candidate fitness score to one task's constants"""
+        
+        # Complex tasks need analytical agents, simple tasks need cooperative agents
+        trait_col = TRAIT_INDEX["analytical" if task.complexity > 0.7 else "cooperative"]
+        expertise_weight = np.float32(0.4 / max(len(task.required_expertise), 1))
+        expertise, completion_rate, capacity, traits = (
+            self._expertise, self._completion_rate, self._capacity, self._traits
         )
         
-        return final_score
+        def score(rows: np.ndarray) -> np.ndarray:
+            """Calculate how well each candidate row fits the task"""
+            return (
+                expertise[np.ix_(rows, required_cols)].sum(axis=1, dtype=np.float32) * expertise_weight +
+                completion_rate[rows] * 0.3 +
+                capacity[rows] * 0.2 +
+                traits[rows, trait_col] * 0.1
+            )
+        
+        return score
 
     def _optimize_team_compatibility(self, agents: List[AgentProfile]) -> List[AgentProfile]:
         """Optimize team for personality and communication compatibility"""
@@ -260,15 +434,15 @@ class AdvancedMultiAgentOrchestrator:
             # Replace least cooperative agent with more cooperative one
             least_cooperative = min(agents, key=lambda a: a.personality_traits.get("cooperative", 0.5))
             
-            # Find replacement
-            for agent_id, agent in self.agents.items():
-                if (agent.id not in [a.id for a in agents] and 
-                    agent.personality_traits.get("cooperative", 0.5) > 0.7 and
-                    agent.available_capacity > 0.2):
-                    # Replace
-                    agents = [a for a in agents if a.id != least_cooperative.id]
-                    agents.append(agent)
-                    break
+            # Find replacement: the most cooperative available agent outside the team
+            n = len(self._row_agent)
+            cooperative = self._traits[:n, TRAIT_INDEX["cooperative"]]
+            eligible = (cooperative > 0.7) & (self._capacity[:n] > 0.2)
+            eligible[[self._agent_row[a.id] for a in agents]] = False
+            if eligible.any():
+                row = int(np.argmax(np.where(eligible, cooperative, -np.inf)))
+                agents = [a for a in agents if a.id != least_cooperative.id]
+                agents.append(self.agents[self._row_agent[row]])
         
         return agents
 
@@ -280,6 +454,7 @@ class AdvancedMultiAgentOrchestrator:
         
         logger.info(f"🚀 Starting execution of task {task_id}")
         task.status = "in_progress"
+        self._task_stats[task_id] = TaskCollaborationStats(team=frozenset(task.assigned_agents))
         
         # Update agent states
         for agent_id in task.assigned_agents:
@@ -288,6 +463,7 @@ class AdvancedMultiAgentOrchestrator:
                 agent.current_state = AgentState.COLLABORATING
                 agent.current_workload += task.complexity * 0.3
                 agent.available_capacity = max(0, agent.available_capacity - task.complexity * 0.3)
+                self._sync_agent_load(agent)
         
         # Simulate collaborative execution phases
         await self._execute_planning_phase(task_id)
@@ -303,31 +479,39 @@ class AdvancedMultiAgentOrchestrator:
         
         logger.info(f"📋 Planning phase for task {task_id}")
         
-        # Simulate planning interactions
-        for i in range(len(task.assigned_agents)):
-            for j in range(i + 1, len(task.assigned_agents)):
-                agent1_id = task.assigned_agents[i]
-                agent2_id = task.assigned_agents[j]
-                
-                # Create planning interaction
-                interaction = AgentInteraction(
-                    id=f"plan_{uuid.uuid4().hex[:8]}",
-                    timestamp=datetime.now(),
+        # Simulate planning interactions, one per agent pair, all stamped with the phase start
+        pairs = list(combinations(task.assigned_agents, 2))
+        if pairs:
+            # Read every pair's trust in one gather, before any of it is updated
+            agent_row = self._agent_row
+            first = np.fromiter((agent_row[a] for a, _ in pairs), dtype=np.intp, count=len(pairs))
+            second = np.fromiter((agent_row[b] for _, b in pairs), dtype=np.intp, count=len(pairs))
+            quality = 0.8 + 0.2 * self._trust[first, second].astype(np.float64)
+            
+            now_ns = time.monotonic_ns()
+            context = {"phase": "planning", "task_id": task_id}
+            content = f"Planning coordination for task: {task.name}"
+            next_id = self._next_id
+            self._record_interactions([
+                AgentInteraction(
+                    id=next_id("plan"),
+                    timestamp=now_ns,
                     initiator_id=agent1_id,
                     recipient_id=agent2_id,
                     interaction_type=InteractionType.COLLABORATION,
-                    context={"phase": "planning", "task_id": task_id},
-                    content=f"Planning coordination for task: {task.name}",
-                    effectiveness_score=0.8 + (0.2 * self._get_trust_level(agent1_id, agent2_id))
+                    context=context,
+                    content=content,
+                    effectiveness_score=score
                 )
-                
-                self.interaction_history.append(interaction)
-                
-                # Update trust levels
-                await self._update_trust_levels(agent1_id, agent2_id, interaction.effectiveness_score)
+                for (agent1_id, agent2_id), score in zip(pairs, quality.tolist())
+            ])
+            
+            # Update trust levels (pairs are distinct, so one scatter per direction)
+            self._adjust_trust(first, second, quality)
         
         # Simulate planning time
-        await asyncio.sleep(2)
+        if self.simulate_latency:
+            await asyncio.sleep(2)
         task.progress = 0.2
 
     async def _execute_collaboration_phase(self, task_id: str):
@@ -342,48 +526,54 @@ class AdvancedMultiAgentOrchestrator:
         for cycle in range(3):  # 3 collaboration cycles
             
             # Knowledge sharing
-            await self._facilitate_knowledge_sharing(task.assigned_agents)
+            self._facilitate_knowledge_sharing(task.assigned_agents, task_id)
             
             # Problem-solving collaboration
-            await self._simulate_collaborative_problem_solving(task_id)
+            self._simulate_collaborative_problem_solving(task_id)
             
             # Conflict resolution if needed
             if self._detect_potential_conflicts(task.assigned_agents):
-                await self._resolve_conflicts(task.assigned_agents, task_id)
+                self._resolve_conflicts(task.assigned_agents, task_id)
             
             # Update progress
             task.progress = 0.2 + (0.6 * (cycle + 1) / 3)
             
-            await asyncio.sleep(1)
+            if self.simulate_latency:
+                await asyncio.sleep(1)
 
-    async def _facilitate_knowledge_sharing(self, agent_ids: List[str]):
+    def _facilitate_knowledge_sharing(self, agent_ids: List[str], task_id: str):
         """Facilitate knowledge sharing between agents"""
         
+        now_ns = time.monotonic_ns()
+        context = {"knowledge_type": "expertise", "task_id": task_id}
+        interactions = []
+        
         for agent_id in agent_ids:
             agent = self.agents.get(agent_id)
             if not agent:
                 continue
             
             # Share knowledge with team members
-            for other_id in agent_ids:
-                if other_id != agent_id:
-                    # Create knowledge sharing interaction
-                    shared_knowledge = f"Expertise in {', '.join(agent.expertise[:2])}"
-                    
-                    interaction = AgentInteraction(
-                        id=f"share_{uuid.uuid4().hex[:8]}",
-                        timestamp=datetime.now(),
-                        initiator_id=agent_id,
-                        recipient_id=other_id,
-                        interaction_type=InteractionType.KNOWLEDGE_SHARING,
-                        context={"knowledge_type": "expertise"},
-                        content=f"Sharing knowledge: {shared_knowledge}",
-                        effectiveness_score=agent.personality_traits.get("cooperative", 0.7)
-                    )
-                    
-                    self.interaction_history.append(interaction)
+            content = f"Sharing knowledge: Expertise in {', '.join(agent.expertise[:2])}"
+            effectiveness = agent.personality_traits.get("cooperative", 0.7)
+            interactions.extend(
+                AgentInteraction(
+                    id=self._next_id("share"),
+                    timestamp=now_ns,
+                    initiator_id=agent_id,
+                    recipient_id=other_id,
+                    interaction_type=InteractionType.KNOWLEDGE_SHARING,
+                    context=context,
+                    content=content,
+                    effectiveness_score=effectiveness
+                )
+                for other_id in agent_ids
+                if other_id != agent_id
+            )
+        
+        self._record_interactions(interactions)
 
-    async def _simulate_collaborative_problem_solving(self, task_id: str):
+    def _simulate_collaborative_problem_solving(self, task_id: str):
         """Simulate agents working together to solve problems"""
         task = self.active_tasks.get(task_id)
         if not task:
@@ -397,9 +587,13 @@ class AdvancedMultiAgentOrchestrator:
             "Quality assurance concern"
         ]
         
-        problem = problems[len(self.interaction_history) % len(problems)]
+        problem = problems[self.total_interactions % len(problems)]
+        required_mask, required_count = self._required_masks[task_id]
+        now_ns = time.monotonic_ns()
+        context = {"problem": problem, "task_id": task_id}
         
         # All agents contribute to solution
+        interactions = []
         for agent_id in task.assigned_agents:
             agent = self.agents.get(agent_id)
             if not agent:
@@ -407,50 +601,43 @@ class AdvancedMultiAgentOrchestrator:
             
             # Generate agent's contribution based on expertise and personality
             contribution_quality = (
-                sum(1 for exp in agent.expertise if exp in task.required_expertise) / max(len(task.required_expertise), 1) * 0.6 +
+                (self._expertise_masks[agent_id] & required_mask).bit_count() / required_count * 0.6 +
                 agent.personality_traits.get("analytical", 0.5) * 0.4
             )
             
-            interaction = AgentInteraction(
-                id=f"solve_{uuid.uuid4().hex[:8]}",
-                timestamp=datetime.now(),
+            interactions.append(AgentInteraction(
+                id=self._next_id("solve"),
+                timestamp=now_ns,
                 initiator_id=agent_id,
                 recipient_id="team",
                 interaction_type=InteractionType.COLLABORATION,
-                context={"problem": problem, "task_id": task_id},
+                context=context,
                 content=f"Proposed solution approach based on {agent.role} expertise",
                 effectiveness_score=contribution_quality
-            )
-            
-            self.interaction_history.append(interaction)
+            ))
+        
+        self._record_interactions(interactions)
 
     def _detect_potential_conflicts(self, agent_ids: List[str]) -> bool:
         """Detect potential conflicts between agents"""
         
-        for i in range(len(agent_ids)):
-            for j in range(i + 1, len(agent_ids)):
-                agent1 = self.agents.get(agent_ids[i])
-                agent2 = self.agents.get(agent_ids[j])
-                
-                if not agent1 or not agent2:
-                    continue
-                
-                # Check personality conflicts
-                assertiveness_diff = abs(
-                    agent1.personality_traits.get("assertive", 0.5) - 
-                    agent2.personality_traits.get("assertive", 0.5)
-                )
-                
-                # Check trust levels
-                trust_level = self._get_trust_level(agent1.id, agent2.id)
-                
-                # Conflict likely if high assertiveness difference and low trust
-                if assertiveness_diff > 0.4 and trust_level < 0.4:
-                    return True
+        agents = [self.agents[agent_id] for agent_id in agent_ids if agent_id in self.agents]
+        if len(agents) < 2:
+            return False
+        
+        # Check personality conflicts across every pair at once
+        rows = [self._agent_row[a.id] for a in agents]
+        assertiveness = self._traits[rows, TRAIT_INDEX["assertive"]]
+        assertiveness_diff = np.abs(assertiveness[:, None] - assertiveness[None, :])
         
-        return False
+        # Check trust levels
+        trust = self._trust[np.ix_(rows, rows)]
+        
+        # Conflict likely if high assertiveness difference and low trust (each pair once)
+        conflicts = (assertiveness_diff > 0.4) & (trust < 0.4)
+        return bool(np.triu(conflicts, k=1).any())
 
-    async def _resolve_conflicts(self, agent_ids: List[str], task_id: str):
+    def _resolve_conflicts(self, agent_ids: List[str], task_id: str):
         """Resolve conflicts between agents through mediation"""
         
         logger.info(f"⚖️ Resolving conflicts for task {task_id}")
@@ -475,23 +662,25 @@ class AdvancedMultiAgentOrchestrator:
         
         if mediator:
             # Create conflict resolution interaction
+            now_ns = time.monotonic_ns()
+            context = {"mediator": mediator.id, "task_id": task_id}
             for agent_id in agent_ids:
                 if agent_id != mediator.id:
                     interaction = AgentInteraction(
-                        id=f"resolve_{uuid.uuid4().hex[:8]}",
-                        timestamp=datetime.now(),
+                        id=self._next_id("resolve"),
+                        timestamp=now_ns,
                         initiator_id=mediator.id,
                         recipient_id=agent_id,
                         interaction_type=InteractionType.CONFLICT_RESOLUTION,
-                        context={"mediator": mediator.id, "task_id": task_id},
+                        context=context,
                         content="Facilitating conflict resolution and alignment",
                         effectiveness_score=0.7 + (best_score * 0.3)
                     )
                     
-                    self.interaction_history.append(interaction)
+                    self._record_interactions([interaction])
                     
                     # Improve trust after successful resolution
-                    await self._update_trust_levels(mediator.id, agent_id, 0.8)
+                    self._update_trust_levels(mediator.id, agent_id, 0.8)
 
     async def _execute_integration_phase(self, task_id: str):
         """Execute integration and finalization phase"""
@@ -503,32 +692,34 @@ class AdvancedMultiAgentOrchestrator:
         
         # Select integration lead (most experienced agent)
         lead_agent = None
-        best_performance = 0
-        
-        for agent_id in task.assigned_agents:
-            performance = self.performance_metrics.get(agent_id, {}).get("task_completion_rate", 0)
-            if performance > best_performance:
-                best_performance = performance
-                lead_agent = self.agents.get(agent_id)
+        team_rows = [self._agent_row[agent_id] for agent_id in task.assigned_agents if agent_id in self._agent_row]
+        if team_rows:
+            performance = self._completion_rate[team_rows]
+            best = int(np.argmax(performance))
+            if performance[best] > 0:
+                lead_agent = self.agents[self._row_agent[team_rows[best]]]
         
         if lead_agent:
             # Create integration interactions
-            for agent_id in task.assigned_agents:
-                if agent_id != lead_agent.id:
-                    interaction = AgentInteraction(
-                        id=f"integrate_{uuid.uuid4().hex[:8]}",
-                        timestamp=datetime.now(),
-                        initiator_id=lead_agent.id,
-                        recipient_id=agent_id,
-                        interaction_type=InteractionType.COLLABORATION,
-                        context={"phase": "integration", "task_id": task_id},
-                        content="Integrating contributions and finalizing solution",
-                        effectiveness_score=0.8
-                    )
-                    
-                    self.interaction_history.append(interaction)
+            now_ns = time.monotonic_ns()
+            context = {"phase": "integration", "task_id": task_id}
+            self._record_interactions([
+                AgentInteraction(
+                    id=self._next_id("integrate"),
+                    timestamp=now_ns,
+                    initiator_id=lead_agent.id,
+                    recipient_id=agent_id,
+                    interaction_type=InteractionType.COLLABORATION,
+                    context=context,
+                    content="Integrating contributions and finalizing solution",
+                    effectiveness_score=0.8
+                )
+                for agent_id in task.assigned_agents
+                if agent_id != lead_agent.id
+            ])
         
-        await asyncio.sleep(1)
+        if self.simulate_latency:
+            await asyncio.sleep(1)
         task.progress = 0.9
 
     async def _complete_task(self, task_id: str):
@@ -543,7 +734,7 @@ class AdvancedMultiAgentOrchestrator:
         task.progress = 1.0
         
         # Calculate task success metrics
-        collaboration_effectiveness = self._calculate_collaboration_effectiveness(task.assigned_agents)
+        collaboration_effectiveness = self._calculate_collaboration_effectiveness(task_id)
         task_quality = 0.8 + (collaboration_effectiveness * 0.2)
         
         # Update agent performance metrics
@@ -561,6 +752,7 @@ class AdvancedMultiAgentOrchestrator:
             agent.current_state = AgentState.IDLE
             agent.current_workload = max(0, agent.current_workload - task.complexity * 0.3)
             agent.available_capacity = min(1.0, agent.available_capacity + task.complexity * 0.3)
+            self._sync_agent_load(agent)
             
             # Add to performance history
             agent.performance_history.append({
@@ -571,72 +763,56 @@ class AdvancedMultiAgentOrchestrator:
             })
         
         # Detect emergent behaviors
-        await self._detect_emergent_behaviors(task_id)
-
-    def _calculate_collaboration_effectiveness(self, agent_ids: List[str]) -> float:
-        """Calculate how effectively agents collaborated"""
+        self._detect_emergent_behaviors(task_id)
         
-        # Get recent interactions for these agents
-        recent_interactions = [
-            interaction for interaction in self.interaction_history[-50:]  # Last 50 interactions
-            if interaction.initiator_id in agent_ids and interaction.recipient_id in agent_ids
-        ]
+        # Per-task scoring state is only needed while the task runs
+        self._task_stats.pop(task_id, None)
+        self._required_masks.pop(task_id, None)
+
+    def _calculate_collaboration_effectiveness(self, task_id: str) -> float:
+        """Calculate how effectively a task's team collaborated"""
         
-        if not recent_interactions:
+        stats = self._task_stats.get(task_id)
+        if not stats or not stats.interaction_count:
             return 0.5
         
         # Calculate average effectiveness
-        avg_effectiveness = sum(
-            interaction.effectiveness_score or 0.5 
-            for interaction in recent_interactions
-        ) / len(recent_interactions)
+        avg_effectiveness = stats.effectiveness_sum / stats.interaction_count
         
         # Bonus for interaction diversity
-        interaction_types = set(interaction.interaction_type for interaction in recent_interactions)
-        diversity_bonus = len(interaction_types) / len(InteractionType) * 0.2
+        diversity_bonus = stats.type_mask.bit_count() / len(InteractionType) * 0.2
         
         return min(1.0, avg_effectiveness + diversity_bonus)
 
-    async def _detect_emergent_behaviors(self, task_id: str):
+    def _detect_emergent_behaviors(self, task_id: str):
         """Detect emergent behaviors from agent interactions"""
         
-        # Analyze recent interaction patterns
-        task_interactions = [
-            interaction for interaction in self.interaction_history
-            if interaction.context.get("task_id") == task_id
-        ]
+        # Analyze the task's interaction aggregates
+        stats = self._task_stats.get(task_id)
         
-        if len(task_interactions) < 5:
+        if not stats or stats.total_count < 5:
             return
         
         # Detect patterns
         emergent_behaviors = []
         
         # Leadership emergence
-        leadership_scores = {}
-        for interaction in task_interactions:
-            if interaction.interaction_type in [InteractionType.DELEGATION, InteractionType.CONFLICT_RESOLUTION]:
-                leadership_scores[interaction.initiator_id] = leadership_scores.get(interaction.initiator_id, 0) + 1
-        
-        if leadership_scores:
-            leader = max(leadership_scores.items(), key=lambda x: x[1])
+        if stats.leadership_scores:
+            leader = stats.leadership_scores.most_common(1)[0]
             emergent_behaviors.append({
                 "type": "natural_leadership",
                 "agent_id": leader[0],
-                "strength": leader[1] / len(task_interactions),
+                "strength": leader[1] / stats.total_count,
                 "description": f"Agent {leader[0]} emerged as natural leader"
             })
         
         # Innovation patterns
-        knowledge_sharing_count = len([
-            i for i in task_interactions 
-            if i.interaction_type == InteractionType.KNOWLEDGE_SHARING
-        ])
+        knowledge_sharing_count = stats.knowledge_sharing_count
         
-        if knowledge_sharing_count > len(task_interactions) * 0.3:
+        if knowledge_sharing_count > stats.total_count * 0.3:
             emergent_behaviors.append({
                 "type": "knowledge_synergy",
-                "strength": knowledge_sharing_count / len(task_interactions),
+                "strength": knowledge_sharing_count / stats.total_count,
                 "description": "High knowledge sharing leading to innovative solutions"
             })
         
@@ -647,46 +823,48 @@ class AdvancedMultiAgentOrchestrator:
 
     def _get_trust_level(self, agent1_id: str, agent2_id: str) -> float:
         """Get trust level between two agents"""
-        agent1 = self.agents.get(agent1_id)
-        if not agent1:
-            return 0.5
+        row1 = self._agent_row.get(agent1_id)
+        row2 = self._agent_row.get(agent2_id)
+        if row1 is None or row2 is None:
+            return 0.5  # Default neutral trust
         
-        return agent1.trust_network.get(agent2_id, 0.5)  # Default neutral trust
+        return float(self._trust[row1, row2])
 
-    async def _update_trust_levels(self, agent1_id: str, agent2_id: str, interaction_quality: float):
+    def _update_trust_levels(self, agent1_id: str, agent2_id: str, interaction_quality: float):
         """Update trust levels based on interaction quality"""
         
-        agent1 = self.agents.get(agent1_id)
-        agent2 = self.agents.get(agent2_id)
+        row1 = self._agent_row.get(agent1_id)
+        row2 = self._agent_row.get(agent2_id)
         
-        if not agent1 or not agent2:
+        if row1 is None or row2 is None:
             return
         
-        # Update trust bidirectionally
-        current_trust1 = agent1.trust_network.get(agent2_id, 0.5)
-        current_trust2 = agent2.trust_network.get(agent1_id, 0.5)
+        self._adjust_trust(np.array([row1]), np.array([row2]), np.array([interaction_quality]))
+
+    def _adjust_trust(self, first: np.ndarray, second: np.ndarray, quality: np.ndarray):
+        """Nudge trust both ways between paired rows (pairs must be distinct)"""
         
         # Gradual trust adjustment
-        trust_adjustment = (interaction_quality - 0.5) * 0.1
+        trust_adjustment = (quality - 0.5) * 0.1
         
-        agent1.trust_network[agent2_id] = max(0, min(1, current_trust1 + trust_adjustment))
-        agent2.trust_network[agent1_id] = max(0, min(1, current_trust2 + trust_adjustment))
+        # Update trust bidirectionally
+        for rows, cols in ((first, second), (second, first)):
+            self._trust[rows, cols] = np.clip(self._trust[rows, cols] + trust_adjustment, 0, 1)
+            self._trust_known[rows, cols] = True
 
     def get_orchestration_metrics(self) -> Dict[str, Any]:
         """Get comprehensive orchestration metrics"""
         
         active_agents = len([a for a in self.agents.values() if a.current_state != AgentState.IDLE])
-        total_interactions = len(self.interaction_history)
-        
-        # Calculate average trust levels
-        all_trust_values = []
-        for agent in self.agents.values():
-            all_trust_values.extend(agent.trust_network.values())
+        total_interactions = self.total_interactions
         
-        avg_trust = sum(all_trust_values) / len(all_trust_values) if all_trust_values else 0.5
+        # Calculate average trust levels over pairs that have interacted
+        n = len(self._row_agent)
+        known_trust = self._trust[:n, :n][self._trust_known[:n, :n]]
+        avg_trust = float(known_trust.mean(dtype=np.float64)) if known_trust.size else 0.5
         
         # Calculate collaboration effectiveness
-        recent_interactions = self.interaction_history[-100:]  # Last 100 interactions
+        recent_interactions = self._recent_interactions(100)  # Last 100 interactions
         avg_effectiveness = sum(
             i.effectiveness_score or 0.5 for i in recent_interactions
         ) / len(recent_interactions) if recent_interactions else 0.5
@@ -2,32 +2,239 @@
 # SEPARATION OF CONCERNS: Agent Service handles all AI/ML intensive operations
 
 import asyncio
+import copy
+import hashlib
+import heapq
 import logging
-from typing import Dict, List, Any, Optional
+import os
+import re
+import time
+from operator import itemgetter
+from collections import OrderedDict
+from typing import Callable, Dict, List, Any, Optional, Set, Tuple, TypeVar
 from datetime import datetime
 import json
+from types import MappingProxyType
 
-from .gemini_service import gemini_service
-from .memory_service import memory_service
+try:
+    import ahocorasick
+except ImportError:  # fall back to KEYWORD_RE
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+from .gemini_service import get_gemini_service
+from .memory_service import get_memory_service
 
 logger = logging.getLogger(__name__)
 
+# In-process cache of intent analyses, keyed by normalized input
+INTENT_CACHE_SIZE = int(os.getenv("INTENT_CACHE_SIZE", "1024"))
+INTENT_CACHE_TTL = float(os.getenv("INTENT_CACHE_TTL", "600"))  # seconds
+
+# Longest we wait on Gemini before answering with the rule-based fallback
+GEMINI_RESPONSE_TIMEOUT = float(os.getenv("GEMINI_RESPONSE_TIMEOUT", "5.0"))  # seconds
+
+# Keyword tables and canned outputs for the rule-based intent features
+# (tuple/dict order is output order; shared between responses, do not mutate)
+GOAL_KEYWORDS = ('automate', 'improve', 'manage', 'create', 'build', 'integrate')
+INDUSTRY_KEYWORDS = ('ecommerce', 'healthcare', 'finance', 'education', 'retail')
+COMPLEXITY_KEYWORDS = ('integration', 'api', 'database', 'multiple', 'complex')
+AGENT_KEYWORDS = {
+    'customer': {
+        "type": "customer_service_agent",
+        "role": "Handle customer inquiries",
+        "priority": "high"
+    },
+    'data': {
+        "type": "data_processor_agent",
+        "role": "Process and analyze data",
+        "priority": "medium"
+    }
+}
+DEFAULT_AGENT = {
+    "type": "general_assistant_agent",
+    "role": "General task automation",
+    "priority": "medium"
+}
+PROCESS_KEYWORDS = {
+    'email': 'Email Processing',
+    'order': 'Order Management',
+    'customer': 'Customer Service',
+    'data': 'Data Processing',
+    'report': 'Report Generation'
+}
+INTEGRATION_KEYWORDS = {
+    'slack': 'Slack API',
+    'email': 'Email/SMTP',
+    'database': 'Database Connection',
+    'api': 'REST API Integration',
+    'webhook': 'Webhook Integration'
+}
+
+# MCP tool catalog: goal keyword -> candidate tools (shared between responses, do not mutate)
+TOOLS_DB = MappingProxyType({
+    "email": (
+        {"name": "Gmail API", "category": "email", "match_score": 9},
+        {"name": "SendGrid", "category": "email", "match_score": 8}
+    ),
+    "data": (
+        {"name": "Pandas Processor", "category": "data", "match_score": 9},
+        {"name": "SQL Connector", "category": "database", "match_score": 8}
+    ),
+    "api": (
+        {"name": "REST Client", "category": "integration", "match_score": 9},
+        {"name": "GraphQL Connector", "category": "integration", "match_score": 7}
+    )
+})
+DEFAULT_TOOL = {"name": "Universal Connector", "category": "general", "match_score": 6}
+# Every catalog keyword in one case-insensitive scan. The lookahead reports matches starting at
+# every position, so overlaps are found; keywords must not be prefixes of one another.
+TOOL_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(TOOLS_DB, key=len, reverse=True)) + "))",
+    re.IGNORECASE
+)
+MAX_DISCOVERED_TOOLS = 10  # top-ranked tools returned per discovery
+SCORE_OF = itemgetter("match_score")
+
+# Static bodies of the fallback responses (shared between responses, do not mutate)
+INTENT_FALLBACK = MappingProxyType({
+    "extracted_goals": ("Automate business process",),
+    "business_context": {"industry": "general", "complexity": "medium"},
+    "complexity_score": 5,
+    "suggested_agents": ({"type": "assistant", "role": "General automation"},),
+    "identified_processes": ("Workflow automation",),
+    "required_integrations": ("API integration",),
+    "clarification_questions": ("What specific process do you want to automate?",),
+    "fallback": True
+})
+COST_FALLBACK = MappingProxyType({
+    "cost_breakdown": {
+        "development": {"total": 5000},
+        "monthly_operational": {"total": 200},
+        "integration_setup": {"total": 500},
+        "scaling_projection": ({"scale": "1x", "monthly_cost": 200},)
+    },
+    "confidence_score": 0.5,
+    "fallback": True
+})
+TOOL_DISCOVERY_FALLBACK = MappingProxyType({
+    "discovered_tools": (
+        {"name": "Universal API Connector", "category": "integration", "match_score": 6},
+        {"name": "Data Processor", "category": "data", "match_score": 6}
+    ),
+    "discovery_confidence": 0.6,
+    "fallback": True
+})
+
+CLARIFICATION_QUESTIONS = (
+    "What specific systems do you want to integrate with?",
+    "How many users will interact with this workflow?",
+    "What's your expected volume of transactions per day?",
+    "Do you have any existing tools that need to be connected?"
+)
+
+# Feature bucket -> keywords it reacts to; all buckets are matched in one scan
+KEYWORD_BUCKETS = {
+    "goal": GOAL_KEYWORDS,
+    "industry": INDUSTRY_KEYWORDS,
+    "complexity": COMPLEXITY_KEYWORDS,
+    "agent": tuple(AGENT_KEYWORDS),
+    "process": tuple(PROCESS_KEYWORDS),
+    "integration": tuple(INTEGRATION_KEYWORDS)
+}
+BUCKETS_BY_KEYWORD = {
+    keyword: tuple(bucket for bucket, bucket_keywords in KEYWORD_BUCKETS.items() if keyword in bucket_keywords)
+    for keywords in KEYWORD_BUCKETS.values()
+    for keyword in keywords
+}
+
+# Regex fallback for the keyword scan when pyahocorasick is not installed. The lookahead
+# matches at every position, longest keyword first; keywords that are prefixes of the
+# matched one (e.g. 'data' in 'database') are implied through KEYWORD_PREFIXES.
+KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(BUCKETS_BY_KEYWORD, key=len, reverse=True)) + "))"
+)
+KEYWORD_PREFIXES = {
+    keyword: tuple(other for other in BUCKETS_BY_KEYWORD if keyword.startswith(other))
+    for keyword in BUCKETS_BY_KEYWORD
+}
+
+T = TypeVar("T")
+
+def dumps_indented(obj: Any) -> str:
+    """Pretty-print JSON for prompts, with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+class GeminiCoalescer:
+    """Share one Gemini request between concurrent callers sending the same prompt"""
+    
+    __slots__ = ("_inflight",)
+    
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+    
+    async def submit(self, prompt: str) -> Any:
+        """Generate a response, joining an identical in-flight request if there is one"""
+        future = self._inflight.get(prompt)
+        if future is None:
+            future = asyncio.ensure_future(get_gemini_service().generate_response(prompt))
+            self._inflight[prompt] = future
+            future.add_done_callback(lambda f: self._release(prompt, f))
+        
+        # Shielded so one caller giving up does not cancel the request for the others
+        return await asyncio.shield(future)
+    
+    def _release(self, prompt: str, future: asyncio.Future):
+        """Forget a finished request; its outcome is marked retrieved even if every caller left"""
+        if self._inflight.get(prompt) is future:
+            del self._inflight[prompt]
+        if not future.cancelled():
+            future.exception()
+
 class AIProcessingService:
     """
     Core AI processing service for Agent Service domain
     Handles: Intent Analysis, Cost Prediction, Agent Intelligence, Simulations
     """
     
+    __slots__ = (
+        "logger", "_kw_automaton", "_bg_tasks", "_coalescer",
+        "_intent_cache", "_intent_cache_hits", "_intent_cache_misses"
+    )
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self._kw_automaton = self._build_keyword_automaton() if ahocorasick is not None else None
+        self._bg_tasks: Set[asyncio.Task] = set()  # strong refs to fire-and-forget writes
+        self._coalescer = GeminiCoalescer()
+        self._intent_cache: OrderedDict = OrderedDict()  # key -> (expires_at, analysis), LRU order
+        self._intent_cache_hits = 0
+        self._intent_cache_misses = 0
         self.logger.info("🧠 AI Processing Service initialized - Agent Service Domain")
     
     async def analyze_user_intent(self, user_input: str) -> Dict[str, Any]:
         """
         Einstein-level intent analysis - Agent Service specialty
         """
+        ts = datetime.utcnow().isoformat()
+        low = user_input.lower()  # the only case-folding pass over the input
+        
+        # Re-submitted prompts are answered from cache without calling Gemini
+        cache_key = self._intent_cache_key(low)
+        cached = self._get_cached_intent(cache_key)
+        if cached is not None:
+            self.logger.info("⚡ Intent analysis served from cache for: %s...", user_input[:50])
+            # Callers get their own copy, so mutating a response can't corrupt the cache
+            return {**copy.deepcopy(cached), "user_input": user_input, "timestamp": ts}
+        
         try:
-            self.logger.info(f"🧠 Processing intent analysis for: {user_input[:50]}...")
+            self.logger.info("🧠 Processing intent analysis for: %s...", user_input[:50])
             
             # Semantic analysis using Gemini
             semantic_prompt = f"""
@@ -47,50 +254,55 @@ class AIProcessingService:
             Return as structured JSON.
             """
             
-            analysis_result = await gemini_service.generate_response(semantic_prompt)
+            # Rule-based features are returned together with the Gemini response
+            analysis_result, features = await self._generate_with(
+                semantic_prompt, lambda: self._rule_based_features(user_input, low)
+            )
             
             # Enhanced processing with memory integration
             processed_analysis = {
                 "user_input": user_input,
                 "semantic_analysis": analysis_result,
-                "extracted_goals": self._extract_goals(user_input),
-                "business_context": self._analyze_business_context(user_input),
-                "complexity_score": self._calculate_complexity(user_input),
-                "suggested_agents": self._suggest_agent_types(user_input),
-                "identified_processes": self._identify_processes(user_input),
-                "required_integrations": self._identify_integrations(user_input),
-                "clarification_questions": self._generate_clarification_questions(user_input),
-                "timestamp": datetime.utcnow().isoformat()
+                **features,
+                "timestamp": ts
             }
             
-            # Store in memory for learning
-            await memory_service.store_interaction({
+            # Store in memory for learning (best effort, off the response path)
+            self._run_in_background(get_memory_service().store_interaction({
                 "type": "intent_analysis",
                 "input": user_input,
                 "analysis": processed_analysis,
-                "timestamp": datetime.utcnow().isoformat()
-            })
+                "timestamp": ts
+            }), "Memory store")
+            
+            self._cache_intent(cache_key, processed_analysis)
             
             self.logger.info("✅ Intent analysis completed successfully")
             return processed_analysis
             
+        except asyncio.TimeoutError:
+            self.logger.warning("⏱️ Intent analysis timed out after %ss, using fallback", GEMINI_RESPONSE_TIMEOUT)
+            return self._fallback_intent_analysis(user_input, ts)
         except Exception as e:
-            self.logger.error(f"❌ Intent analysis failed: {str(e)}")
-            return self._fallback_intent_analysis(user_input)
+            self.logger.error("❌ Intent analysis failed: %s", e)
+            return self._fallback_intent_analysis(user_input, ts)
     
     async def predict_costs(self, blueprint: Dict[str, Any]) -> Dict[str, Any]:
         """
         AI-driven cost prediction - Agent Service specialty
         """
+        ts = datetime.utcnow().isoformat()
+        
         try:
             self.logger.info("💰 Processing cost prediction...")
             
-            # Analyze blueprint complexity
+            # Analyze blueprint complexity (missing sections default to empty tuples, not fresh lists)
+            complexity_score = (blueprint.get("analysis") or {}).get("complexity_score", 1)
             complexity_factors = {
-                "agent_count": len(blueprint.get("agents", [])),
-                "integration_count": len(blueprint.get("integrations", [])),
-                "process_complexity": blueprint.get("analysis", {}).get("complexity_score", 1),
-                "estimated_volume": self._estimate_volume(blueprint)
+                "agent_count": len(blueprint.get("agents") or ()),
+                "integration_count": len(blueprint.get("integrations") or ()),
+                "process_complexity": complexity_score,
+                "estimated_volume": self._estimate_volume(complexity_score)
             }
             
             # AI-powered cost calculation
@@ -112,41 +324,44 @@ class AIProcessingService:
             Return as structured JSON with reasoning.
             """
             
-            cost_analysis = await gemini_service.generate_response(cost_prompt)
+            # Local cost model is returned together with the Gemini response
+            cost_analysis, cost_breakdown = await self._generate_with(
+                cost_prompt, lambda: self._calculate_cost_breakdown(complexity_factors)
+            )
             
             prediction = {
                 "blueprint_id": blueprint.get("id"),
                 "complexity_factors": complexity_factors,
-                "cost_breakdown": {
-                    "development": self._calculate_development_cost(complexity_factors),
-                    "monthly_operational": self._calculate_operational_cost(complexity_factors),
-                    "integration_setup": self._calculate_integration_cost(complexity_factors),
-                    "scaling_projection": self._calculate_scaling_cost(complexity_factors)
-                },
+                "cost_breakdown": cost_breakdown,
                 "ai_analysis": cost_analysis,
                 "confidence_score": self._calculate_confidence(complexity_factors),
                 "recommendations": self._generate_cost_recommendations(complexity_factors),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": ts
             }
             
             self.logger.info("✅ Cost prediction completed")
             return prediction
             
+        except asyncio.TimeoutError:
+            self.logger.warning("⏱️ Cost prediction timed out after %ss, using fallback", GEMINI_RESPONSE_TIMEOUT)
+            return self._fallback_cost_prediction(blueprint, ts)
         except Exception as e:
-            self.logger.error(f"❌ Cost prediction failed: {str(e)}")
-            return self._fallback_cost_prediction(blueprint)
+            self.logger.error("❌ Cost prediction failed: %s", e)
+            return self._fallback_cost_prediction(blueprint, ts)
     
     async def discover_mcp_tools(self, goals: List[str]) -> List[Dict[str, Any]]:
         """
         MCP tool discovery - Agent Service specialty
         """
+        ts = datetime.utcnow().isoformat()
+        
         try:
-            self.logger.info(f"🔗 Discovering MCP tools for {len(goals)} goals...")
+            self.logger.info("🔗 Discovering MCP tools for %d goals...", len(goals))
             
             # AI-powered tool matching
             discovery_prompt = f"""
             Discover optimal MCP (Model Context Protocol) tools for these goals:
-            {json.dumps(goals, indent=2)}
+            {dumps_indented(goals)}
             
             For each goal, suggest:
             1. Tool name and category
@@ -158,54 +373,137 @@ class AIProcessingService:
             Return as structured JSON array.
             """
             
-            tool_suggestions = await gemini_service.generate_response(discovery_prompt)
-            
-            # Enhanced tool discovery with capability matching
-            discovered_tools = []
-            for goal in goals:
-                tools = self._match_tools_to_goal(goal)
-                discovered_tools.extend(tools)
-            
-            # Remove duplicates and rank by relevance
-            unique_tools = self._deduplicate_and_rank_tools(discovered_tools)
+            # Local capability matching is returned together with the Gemini response
+            tool_suggestions, unique_tools = await self._generate_with(
+                discovery_prompt, lambda: self._match_tools_to_goals(goals)
+            )
             
             result = {
                 "goals": goals,
                 "discovered_tools": unique_tools,
                 "ai_suggestions": tool_suggestions,
                 "discovery_confidence": self._calculate_discovery_confidence(unique_tools),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": ts
             }
             
-            self.logger.info(f"✅ Discovered {len(unique_tools)} MCP tools")
+            self.logger.info("✅ Discovered %d MCP tools", len(unique_tools))
             return result
             
+        except asyncio.TimeoutError:
+            self.logger.warning("⏱️ MCP tool discovery timed out after %ss, using fallback", GEMINI_RESPONSE_TIMEOUT)
+            return self._fallback_tool_discovery(goals, ts)
         except Exception as e:
-            self.logger.error(f"❌ MCP tool discovery failed: {str(e)}")
-            return self._fallback_tool_discovery(goals)
+            self.logger.error("❌ MCP tool discovery failed: %s", e)
+            return self._fallback_tool_discovery(goals, ts)
+    
+    # Intent cache helpers
+    def _intent_cache_key(self, low: str) -> bytes:
+        """Cache key for lowercased input, ignoring whitespace differences"""
+        return hashlib.blake2b(" ".join(low.split()).encode(), digest_size=16).digest()
+    
+    def _get_cached_intent(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Return a live cached analysis, dropping it if expired"""
+        entry = self._intent_cache.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._intent_cache[key]
+            self._intent_cache_misses += 1
+            return None
+        
+        self._intent_cache.move_to_end(key)
+        self._intent_cache_hits += 1
+        return entry[1]
+    
+    def _cache_intent(self, key: bytes, analysis: Dict[str, Any]):
+        """Cache an analysis, evicting the least recently used entries past the size limit"""
+        # Stored as a copy, since the original is also returned to the first caller
+        self._intent_cache[key] = (time.monotonic() + INTENT_CACHE_TTL, copy.deepcopy(analysis))
+        self._intent_cache.move_to_end(key)
+        while len(self._intent_cache) > INTENT_CACHE_SIZE:
+            self._intent_cache.popitem(last=False)
+    
+    def cache_info(self) -> Dict[str, Any]:
+        """Intent cache statistics"""
+        lookups = self._intent_cache_hits + self._intent_cache_misses
+        return {
+            "hits": self._intent_cache_hits,
+            "misses": self._intent_cache_misses,
+            "hit_rate": self._intent_cache_hits / lookups if lookups else 0.0,
+            "size": len(self._intent_cache),
+            "max_size": INTENT_CACHE_SIZE,
+            "ttl_seconds": INTENT_CACHE_TTL
+        }
     
     # Helper methods for AI processing
-    def _extract_goals(self, user_input: str) -> List[str]:
-        """Extract business goals from user input"""
-        # AI-powered goal extraction logic
-        keywords = ['automate', 'improve', 'manage', 'create', 'build', 'integrate']
-        goals = []
+    async def _generate_with(self, prompt: str, work: Callable[[], T]) -> Tuple[Any, T]:
+        """Run synchronous local work, then generate for `prompt`, waiting at most GEMINI_RESPONSE_TIMEOUT.
         
-        for keyword in keywords:
-            if keyword in user_input.lower():
-                goals.append(f"Process automation related to {keyword}")
+        The work holds the event loop, so the request only goes out once it returns.
+        """
+        local_result = work()
+        return await asyncio.wait_for(self._coalescer.submit(prompt), GEMINI_RESPONSE_TIMEOUT), local_result
+    
+    def _run_in_background(self, coro, description: str):
+        """Schedule a best-effort coroutine without awaiting it; failures are logged"""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(lambda t: self._background_done(t, description))
+    
+    def _background_done(self, task: asyncio.Task, description: str):
+        """Release a finished background task and log its failure, if any"""
+        self._bg_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error("❌ %s failed: %s", description, task.exception())
+    
+    def _rule_based_features(self, user_input: str, low: Optional[str] = None) -> Dict[str, Any]:
+        """Keyword-driven intent features; one keyword scan feeds all of them"""
+        hits = self._scan(user_input, low)
+        return {
+            "extracted_goals": self._extract_goals(user_input, hits),
+            "business_context": self._analyze_business_context(user_input, hits),
+            "complexity_score": self._calculate_complexity(user_input, hits),
+            "suggested_agents": self._suggest_agent_types(user_input, hits),
+            "identified_processes": self._identify_processes(user_input, hits),
+            "required_integrations": self._identify_integrations(user_input, hits),
+            "clarification_questions": self._generate_clarification_questions(user_input)
+        }
+    
+    def _build_keyword_automaton(self) -> "ahocorasick.Automaton":
+        """Build one Aho-Corasick automaton over every feature keyword"""
+        automaton = ahocorasick.Automaton()
+        for keyword, buckets in BUCKETS_BY_KEYWORD.items():
+            automaton.add_word(keyword, (keyword, buckets))
+        automaton.make_automaton()
+        return automaton
+    
+    def _scan(self, user_input: str, low: Optional[str] = None) -> Dict[str, Set[str]]:
+        """Find every feature keyword in the input in a single pass, grouped by bucket"""
+        low = low or user_input.lower()
+        hits = {bucket: set() for bucket in KEYWORD_BUCKETS}
+        
+        if self._kw_automaton is not None:
+            for _, (keyword, buckets) in self._kw_automaton.iter(low):
+                for bucket in buckets:
+                    hits[bucket].add(keyword)
+            return hits
+        
+        for matched in KEYWORD_RE.findall(low):
+            for keyword in KEYWORD_PREFIXES[matched]:
+                for bucket in BUCKETS_BY_KEYWORD[keyword]:
+                    hits[bucket].add(keyword)
+        return hits
+    
+    def _extract_goals(self, user_input: str, hits: Optional[Dict[str, Set[str]]] = None) -> List[str]:
+        """Extract business goals from user input"""
+        found = (hits or self._scan(user_input))["goal"]
+        goals = [f"Process automation related to {keyword}" for keyword in GOAL_KEYWORDS if keyword in found]
         
         return goals or ["General workflow automation"]
     
-    def _analyze_business_context(self, user_input: str) -> Dict[str, Any]:
+    def _analyze_business_context(self, user_input: str, hits: Optional[Dict[str, Set[str]]] = None) -> Dict[str, Any]:
         """Analyze business context and industry"""
-        industries = ['ecommerce', 'healthcare', 'finance', 'education', 'retail']
-        detected_industry = 'general'
-        
-        for industry in industries:
-            if industry in user_input.lower():
-                detected_industry = industry
-                break
+        found = (hits or self._scan(user_input))["industry"]
+        detected_industry = next((industry for industry in INDUSTRY_KEYWORDS if industry in found), 'general')
         
         return {
             "industry": detected_industry,
@@ -213,165 +511,105 @@ class AIProcessingService:
             "complexity_level": "moderate"
         }
     
-    def _calculate_complexity(self, user_input: str) -> int:
+    def _calculate_complexity(self, user_input: str, hits: Optional[Dict[str, Set[str]]] = None) -> int:
         """Calculate complexity score 1-10"""
-        complexity_indicators = ['integration', 'api', 'database', 'multiple', 'complex']
         score = 3  # Base score
-        
-        for indicator in complexity_indicators:
-            if indicator in user_input.lower():
-                score += 1
+        score += len((hits or self._scan(user_input))["complexity"])
         
         return min(score, 10)
     
-    def _suggest_agent_types(self, user_input: str) -> List[Dict[str, Any]]:
+    def _suggest_agent_types(self, user_input: str, hits: Optional[Dict[str, Set[str]]] = None) -> List[Dict[str, Any]]:
         """Suggest appropriate agent types"""
-        agents = []
-        
-        if 'customer' in user_input.lower():
-            agents.append({
-                "type": "customer_service_agent",
-                "role": "Handle customer inquiries",
-                "priority": "high"
-            })
-        
-        if 'data' in user_input.lower():
-            agents.append({
-                "type": "data_processor_agent", 
-                "role": "Process and analyze data",
-                "priority": "medium"
-            })
+        found = (hits or self._scan(user_input))["agent"]
+        agents = [dict(agent) for keyword, agent in AGENT_KEYWORDS.items() if keyword in found]
         
-        return agents or [{
-            "type": "general_assistant_agent",
-            "role": "General task automation",
-            "priority": "medium"
-        }]
+        return agents or [dict(DEFAULT_AGENT)]
     
-    def _identify_processes(self, user_input: str) -> List[str]:
+    def _identify_processes(self, user_input: str, hits: Optional[Dict[str, Set[str]]] = None) -> List[str]:
         """Identify business processes"""
-        processes = []
-        
-        process_keywords = {
-            'email': 'Email Processing',
-            'order': 'Order Management', 
-            'customer': 'Customer Service',
-            'data': 'Data Processing',
-            'report': 'Report Generation'
-        }
-        
-        for keyword, process in process_keywords.items():
-            if keyword in user_input.lower():
-                processes.append(process)
+        found = (hits or self._scan(user_input))["process"]
+        processes = [process for keyword, process in PROCESS_KEYWORDS.items() if keyword in found]
         
         return processes or ['General Automation']
     
-    def _identify_integrations(self, user_input: str) -> List[str]:
+    def _identify_integrations(self, user_input: str, hits: Optional[Dict[str, Set[str]]] = None) -> List[str]:
         """Identify required integrations"""
-        integrations = []
-        
-        integration_keywords = {
-            'slack': 'Slack API',
-            'email': 'Email/SMTP',
-            'database': 'Database Connection',
-            'api': 'REST API Integration',
-            'webhook': 'Webhook Integration'
-        }
-        
-        for keyword, integration in integration_keywords.items():
-            if keyword in user_input.lower():
-                integrations.append(integration)
+        found = (hits or self._scan(user_input))["integration"]
+        integrations = [integration for keyword, integration in INTEGRATION_KEYWORDS.items() if keyword in found]
         
         return integrations or ['Basic API Integration']
     
     def _generate_clarification_questions(self, user_input: str) -> List[str]:
         """Generate intelligent clarification questions"""
-        return [
-            "What specific systems do you want to integrate with?",
-            "How many users will interact with this workflow?", 
-            "What's your expected volume of transactions per day?",
-            "Do you have any existing tools that need to be connected?"
-        ]
-    
-    def _fallback_intent_analysis(self, user_input: str) -> Dict[str, Any]:
+        return list(CLARIFICATION_QUESTIONS)
+    
+    def _fallback_intent_analysis(self, user_input: str, timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Fallback analysis when AI fails"""
         return {
             "user_input": user_input,
-            "extracted_goals": ["Automate business process"],
-            "business_context": {"industry": "general", "complexity": "medium"},
-            "complexity_score": 5,
-            "suggested_agents": [{"type": "assistant", "role": "General automation"}],
-            "identified_processes": ["Workflow automation"],
-            "required_integrations": ["API integration"],
-            "clarification_questions": ["What specific process do you want to automate?"],
-            "fallback": True,
-            "timestamp": datetime.utcnow().isoformat()
+            **copy.deepcopy(dict(INTENT_FALLBACK)),
+            "timestamp": timestamp or datetime.utcnow().isoformat()
         }
     
     # Cost prediction helper methods
-    def _estimate_volume(self, blueprint: Dict[str, Any]) -> int:
+    def _estimate_volume(self, complexity_score: float) -> int:
         """Estimate operational volume"""
         base_volume = 1000  # Base operations per month
-        complexity_multiplier = blueprint.get("analysis", {}).get("complexity_score", 1)
-        return int(base_volume * complexity_multiplier)
-    
-    def _calculate_development_cost(self, factors: Dict[str, Any]) -> Dict[str, Any]:
-        """Calculate development costs"""
-        base_cost = 5000
-        agent_cost = factors["agent_count"] * 1000
-        integration_cost = factors["integration_count"] * 500
-        complexity_multiplier = factors["process_complexity"] / 10
-        
-        total = (base_cost + agent_cost + integration_cost) * (1 + complexity_multiplier)
-        
-        return {
-            "total": int(total),
-            "breakdown": {
-                "base": base_cost,
-                "agents": agent_cost,
-                "integrations": integration_cost,
-                "complexity_adjustment": int(total - base_cost - agent_cost - integration_cost)
-            }
-        }
+        return int(base_volume * complexity_score)
     
-    def _calculate_operational_cost(self, factors: Dict[str, Any]) -> Dict[str, Any]:
-        """Calculate monthly operational costs"""
-        base_cost = 100
-        volume_cost = factors["estimated_volume"] * 0.01  # $0.01 per operation
-        agent_cost = factors["agent_count"] * 50  # $50 per agent per month
+    def _calculate_cost_breakdown(self, factors: Dict[str, Any]) -> Dict[str, Any]:
+        """Calculate development, operational, integration and scaling costs in one pass"""
+        agent_count = factors["agent_count"]
+        integration_count = factors["integration_count"]
+        estimated_volume = factors["estimated_volume"]
+        
+        # Development costs
+        dev_base = 5000
+        dev_agents = agent_count * 1000
+        dev_integrations = integration_count * 500
+        complexity_multiplier = factors["process_complexity"] / 10
+        dev_total = (dev_base + dev_agents + dev_integrations) * (1 + complexity_multiplier)
         
-        total = base_cost + volume_cost + agent_cost
+        # Monthly operational costs
+        ops_base = 100
+        ops_volume = estimated_volume * 0.01  # $0.01 per operation
+        ops_agents = agent_count * 50  # $50 per agent per month
+        monthly = int(ops_base + ops_volume + ops_agents)
         
-        return {
-            "total": int(total),
-            "breakdown": {
-                "base_infrastructure": base_cost,
-                "volume_based": int(volume_cost),
-                "agent_runtime": agent_cost
-            }
-        }
-    
-    def _calculate_integration_cost(self, factors: Dict[str, Any]) -> Dict[str, Any]:
-        """Calculate integration setup costs"""
+        # Integration setup costs
         cost_per_integration = 300
-        total = factors["integration_count"] * cost_per_integration
         
         return {
-            "total": total,
-            "per_integration": cost_per_integration,
-            "count": factors["integration_count"]
+            "development": {
+                "total": int(dev_total),
+                "breakdown": {
+                    "base": dev_base,
+                    "agents": dev_agents,
+                    "integrations": dev_integrations,
+                    "complexity_adjustment": int(dev_total - dev_base - dev_agents - dev_integrations)
+                }
+            },
+            "monthly_operational": {
+                "total": monthly,
+                "breakdown": {
+                    "base_infrastructure": ops_base,
+                    "volume_based": int(ops_volume),
+                    "agent_runtime": ops_agents
+                }
+            },
+            "integration_setup": {
+                "total": integration_count * cost_per_integration,
+                "per_integration": cost_per_integration,
+                "count": integration_count
+            },
+            # Scaling projections reuse the monthly total instead of recomputing it
+            "scaling_projection": [
+                {"scale": "1x", "monthly_cost": monthly, "volume": estimated_volume},
+                {"scale": "5x", "monthly_cost": monthly * 4, "volume": estimated_volume * 5},
+                {"scale": "10x", "monthly_cost": monthly * 7, "volume": estimated_volume * 10}
+            ]
         }
     
-    def _calculate_scaling_cost(self, factors: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Calculate scaling cost projections"""
-        base_monthly = self._calculate_operational_cost(factors)["total"]
-        
-        return [
-            {"scale": "1x", "monthly_cost": base_monthly, "volume": factors["estimated_volume"]},
-            {"scale": "5x", "monthly_cost": base_monthly * 4, "volume": factors["estimated_volume"] * 5},
-            {"scale": "10x", "monthly_cost": base_monthly * 7, "volume": factors["estimated_volume"] * 10}
-        ]
-    
     def _calculate_confidence(self, factors: Dict[str, Any]) -> float:
         """Calculate prediction confidence score"""
         confidence = 0.8  # Base confidence
@@ -401,78 +639,67 @@ class AIProcessingService:
         
         return recommendations or ["Current configuration appears cost-optimized"]
     
-    def _fallback_cost_prediction(self, blueprint: Dict[str, Any]) -> Dict[str, Any]:
+    def _fallback_cost_prediction(self, blueprint: Dict[str, Any], timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Fallback cost prediction"""
         return {
             "blueprint_id": blueprint.get("id"),
-            "cost_breakdown": {
-                "development": {"total": 5000},
-                "monthly_operational": {"total": 200},
-                "integration_setup": {"total": 500},
-                "scaling_projection": [{"scale": "1x", "monthly_cost": 200}]
-            },
-            "confidence_score": 0.5,
-            "fallback": True,
-            "timestamp": datetime.utcnow().isoformat()
+            **copy.deepcopy(dict(COST_FALLBACK)),
+            "timestamp": timestamp or datetime.utcnow().isoformat()
         }
     
     # MCP tool discovery helper methods
+    def _match_tools_to_goals(self, goals: List[str]) -> List[Dict[str, Any]]:
+        """Match tools to every goal, deduplicated and ranked by relevance"""
+        discovered_tools = []
+        for goal in goals:
+            tools = self._match_tools_to_goal(goal)
+            discovered_tools.extend(tools)
+        
+        return self._deduplicate_and_rank_tools(discovered_tools)
+    
     def _match_tools_to_goal(self, goal: str) -> List[Dict[str, Any]]:
         """Match tools to specific goals"""
-        tools_db = {
-            "email": [
-                {"name": "Gmail API", "category": "email", "match_score": 9},
-                {"name": "SendGrid", "category": "email", "match_score": 8}
-            ],
-            "data": [
-                {"name": "Pandas Processor", "category": "data", "match_score": 9},
-                {"name": "SQL Connector", "category": "database", "match_score": 8}
-            ],
-            "api": [
-                {"name": "REST Client", "category": "integration", "match_score": 9},
-                {"name": "GraphQL Connector", "category": "integration", "match_score": 7}
-            ]
-        }
+        found = {keyword.lower() for keyword in TOOL_KEYWORD_RE.findall(goal)}
+        if not found:
+            return [DEFAULT_TOOL]
         
-        matched_tools = []
-        for keyword, tools in tools_db.items():
-            if keyword in goal.lower():
-                matched_tools.extend(tools)
-        
-        return matched_tools or [{"name": "Universal Connector", "category": "general", "match_score": 6}]
+        # Catalog order, so ranking ties resolve the same way regardless of word order in the goal
+        return [tool for keyword, tools in TOOLS_DB.items() if keyword in found for tool in tools]
     
     def _deduplicate_and_rank_tools(self, tools: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicates and rank by relevance"""
         unique_tools = {}
         
         for tool in tools:
-            name = tool["name"]
-            if name not in unique_tools or tool["match_score"] > unique_tools[name]["match_score"]:
-                unique_tools[name] = tool
+            current = unique_tools.get(tool["name"])
+            if current is None or tool["match_score"] > current["match_score"]:
+                unique_tools[tool["name"]] = tool
         
-        # Sort by match score
-        return sorted(unique_tools.values(), key=lambda x: x["match_score"], reverse=True)
+        # Keep the best matches by score (ties keep discovery order), copied off the shared catalog
+        return [dict(tool) for tool in heapq.nlargest(MAX_DISCOVERED_TOOLS, unique_tools.values(), key=SCORE_OF)]
     
     def _calculate_discovery_confidence(self, tools: List[Dict[str, Any]]) -> float:
         """Calculate tool discovery confidence"""
         if not tools:
             return 0.3
         
-        avg_score = sum(tool["match_score"] for tool in tools) / len(tools)
+        avg_score = sum(map(SCORE_OF, tools)) / len(tools)
         return min(avg_score / 10, 1.0)
     
-    def _fallback_tool_discovery(self, goals: List[str]) -> Dict[str, Any]:
+    def _fallback_tool_discovery(self, goals: List[str], timestamp: Optional[str] = None) -> Dict[str, Any]:
         """Fallback tool discovery"""
         return {
             "goals": goals,
-            "discovered_tools": [
-                {"name": "Universal API Connector", "category": "integration", "match_score": 6},
-                {"name": "Data Processor", "category": "data", "match_score": 6}
-            ],
-            "discovery_confidence": 0.6,
-            "fallback": True,
-            "timestamp": datetime.utcnow().isoformat()
+            **copy.deepcopy(dict(TOOL_DISCOVERY_FALLBACK)),
+            "timestamp": timestamp or datetime.utcnow().isoformat()
         }
 
-# Singleton instance
-ai_processing_service = AIProcessingService()
\ No newline at end of file
+# Singleton instance, created on first use
+_ai_processing_service = None
+
+def get_ai_processing_service() -> AIProcessingService:
+    """Get the singleton AIProcessingService instance."""
+    global _ai_processing_service
+    if _ai_processing_service is None:
+        _ai_processing_service = AIProcessingService()
+    return _ai_processing_service
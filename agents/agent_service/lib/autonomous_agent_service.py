@@ -5,15 +5,18 @@ Handles autonomous decision making, self-healing, and optimization
 
 import asyncio
 import logging
+import os
 import time
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
-import json
-import statistics
-from dataclasses import dataclass, asdict
-from enum import Enum
-
-@dataclass
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from datetime import datetime
+from collections import deque
+from itertools import islice
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import numpy as np
+
+@dataclass(slots=True)
 class HealthMetric:
     metric_name: str
     value: float
@@ -21,21 +24,135 @@ class HealthMetric:
     status: str
     timestamp: datetime
     impact_level: str
-
-@dataclass
+    higher_is_better: bool = False
+
+@dataclass(slots=True)
+class Anomaly:
+    type: str
+    severity: str
+    detected_at: str
+    metric: Optional[str] = None
+    current_value: Optional[float] = None
+    expected_range: Optional[Tuple[float, float]] = None
+    threshold: Optional[float] = None
+    description: Optional[str] = None
+
+@dataclass(slots=True)
 class OptimizationAction:
     action_type: str
     target_component: str
-    parameters: Dict[str, Any]
     expected_impact: float
     priority: int
+    current_value: Optional[float] = None
+    target_value: Optional[float] = None
     executed_at: Optional[datetime] = None
 
-class AlertLevel(Enum):
-    INFO = "info"
-    WARNING = "warning"
-    CRITICAL = "critical"
-    EMERGENCY = "emergency"
+# Samples retained per metric for trend and anomaly analysis
+METRIC_HISTORY_SIZE = 100
+
+# Optimization actions retained for auditing; older ones are dropped
+OPTIMIZATION_HISTORY_SIZE = int(os.getenv("OPTIMIZATION_HISTORY_SIZE", "1000"))
+
+# Decay applied to the running anomaly statistics (effective window ~50 samples)
+ANOMALY_STATS_DECAY = 0.98
+
+# Samples a metric needs before it is checked for anomalies
+ANOMALY_MIN_SAMPLES = 10
+
+# Samples used for trend prediction
+TREND_WINDOW = 5
+
+# Windows longer than this compute their trend with NumPy; shorter ones stay in Python
+TREND_VECTORIZE_MIN = 16
+
+# Polling interval per metric category (seconds) - resources move fastest
+METRIC_POLL_INTERVALS = MappingProxyType({
+    'resources': 1.0,
+    'performance': 2.0,
+    'reliability': 5.0,
+    'availability': 30.0
+})
+
+# Metric -> optimization strategy; anything unlisted is treated as resource exhaustion
+METRIC_STRATEGIES = MappingProxyType({
+    'response_time': 'high_latency',
+    'error_rate': 'high_error_rate',
+    'memory_usage': 'resource_exhaustion',
+    'cpu_usage': 'resource_exhaustion',
+    'throughput': 'low_throughput'
+})
+
+HEALTH_RECOMMENDATIONS = (
+    "🔍 Enable predictive monitoring for proactive issue detection",
+    "⚡ Implement auto-scaling based on demand patterns",
+    "🛡️ Deploy circuit breakers for critical service dependencies",
+    "📊 Set up real-time performance dashboards",
+    "🔄 Configure automated backup and recovery procedures"
+)
+
+# Optimization strategies: name -> (strategy label, actions taken, expected improvement)
+OPTIMIZATION_STRATEGIES = MappingProxyType({
+    'high_latency': (
+        'latency_optimization',
+        (
+            'Enable aggressive caching',
+            'Optimize database queries',
+            'Implement connection pooling',
+            'Enable response compression'
+        ),
+        '25-40% latency reduction'
+    ),
+    'high_error_rate': (
+        'error_optimization',
+        (
+            'Implement circuit breakers',
+            'Add retry mechanisms',
+            'Enhance error monitoring',
+            'Improve graceful degradation'
+        ),
+        '50-70% error reduction'
+    ),
+    'resource_exhaustion': (
+        'resource_optimization',
+        (
+            'Implement auto-scaling',
+            'Optimize memory allocation',
+            'Enable resource pooling',
+            'Implement garbage collection tuning'
+        ),
+        '30-50% resource efficiency'
+    ),
+    'low_throughput': (
+        'throughput_optimization',
+        (
+            'Implement request batching',
+            'Enable parallel processing',
+            'Optimize API endpoints',
+            'Implement load balancing'
+        ),
+        '40-60% throughput increase'
+    ),
+    'memory_leak': (
+        'memory_optimization',
+        (
+            'Force garbage collection',
+            'Clear unnecessary caches',
+            'Optimize object lifecycle',
+            'Implement memory monitoring'
+        ),
+        '20-35% memory reduction'
+    ),
+    'cascade_failure': (
+        'cascade_prevention',
+        (
+            'Implement circuit breakers',
+            'Enable service isolation',
+            'Add health checks',
+            'Implement graceful degradation'
+        ),
+        '90% cascade failure prevention'
+    )
+})
 
 class AutonomousAgentService:
     """
@@ -51,9 +168,22 @@ class AutonomousAgentService:
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.health_metrics: Dict[str, List[HealthMetric]] = {}
-        self.optimization_history: List[OptimizationAction] = []
+        self.health_metrics: Dict[str, deque] = {}
+        # Metrics with a full trend window, in the order they became ready
+        self._trend_ready: List[str] = []
+        # Decayed running [sum, sum of squares, weight] per metric, one row each
+        self._metric_rows: Dict[str, int] = {}
+        self._metric_names: List[str] = []
+        self._metric_stats = np.zeros((0, 3))
+        self._latest_values = np.zeros(0)
+        self._latest_degraded = np.zeros(0, dtype=bool)
+        self._sample_counts = np.zeros(0, dtype=np.int64)
+        self.optimization_history: deque = deque(maxlen=OPTIMIZATION_HISTORY_SIZE)
         self.autonomous_mode = True
+        
+        # Pluggable detectors; unset until temporal and exhaustion models exist
+        self._time_pattern_detector: Optional[Callable[[], bool]] = None
+        self._resource_exhaustion_predictor: Optional[Callable[[], bool]] = None
         self.learning_enabled = True
         
         # Performance baselines
@@ -66,15 +196,21 @@ class AutonomousAgentService:
             'throughput': 1000.0     # requests/min
         }
         
-        # Optimization strategies
-        self.optimization_strategies = {
-            'high_latency': self._optimize_latency,
-            'high_error_rate': self._optimize_error_handling,
-            'resource_exhaustion': self._optimize_resources,
-            'low_throughput': self._optimize_throughput,
-            'memory_leak': self._handle_memory_issues,
-            'cascade_failure': self._prevent_cascade_failure
-        }
+        # Metric polling schedule:
+        # [name, value, threshold, higher_is_better, category, interval, last polled (monotonic)]
+        self._metric_schedule = [
+            [name, value, threshold, higher_is_better, category, METRIC_POLL_INTERVALS[category], float('-inf')]
+            for name, value, threshold, higher_is_better, category in (
+                ('response_time', 150.0, 200.0, False, 'performance'),
+                ('success_rate', 0.97, 0.95, True, 'reliability'),
+                ('memory_usage', 0.65, 0.80, False, 'resources'),
+                ('cpu_usage', 0.55, 0.70, False, 'resources'),
+                ('error_rate', 0.02, 0.05, False, 'reliability'),
+                ('throughput', 1200.0, 1000.0, True, 'performance'),
+                ('agent_availability', 0.99, 0.98, True, 'availability'),
+                ('workflow_completion', 0.96, 0.95, True, 'reliability')
+            )
+        ]
 
     async def monitor_system_health(self) -> Dict[str, Any]:
         """
@@ -82,12 +218,22 @@ class AutonomousAgentService:
         Einstein-level awareness of system state
         """
         try:
+            # One clock read per monitoring cycle
+            now = datetime.now()
+            
+            # The four stages only read stored history, so run them concurrently
+            metrics, anomalies, predictions, recommendations = await asyncio.gather(
+                self._collect_health_metrics(now, due_only=True),
+                self._detect_anomalies(now.isoformat()),
+                self._predict_future_issues(),
+                self._generate_health_recommendations()
+            )
             health_data = {
                 'overall_status': 'healthy',
-                'metrics': await self._collect_health_metrics(),
-                'anomalies': await self._detect_anomalies(),
-                'predictions': await self._predict_future_issues(),
-                'recommendations': await self._generate_health_recommendations()
+                'metrics': metrics,
+                'anomalies': anomalies,
+                'predictions': predictions,
+                'recommendations': recommendations
             }
             
             # Store metrics for trend analysis
@@ -100,28 +246,27 @@ class AutonomousAgentService:
             return health_data
             
         except Exception as e:
-            self.logger.error(f"Health monitoring failed: {e}")
+            self.logger.error("Health monitoring failed: %s", e)
             return {'overall_status': 'monitoring_error', 'error': str(e)}
 
-    async def _collect_health_metrics(self) -> List[HealthMetric]:
-        """Collect comprehensive system health metrics"""
+    async def _collect_health_metrics(self, now: Optional[datetime] = None, due_only: bool = False) -> List[HealthMetric]:
+        """Collect system health metrics; due_only skips metrics polled within their interval"""
         metrics = []
-        current_time = datetime.now()
+        current_time = now or datetime.now()
+        tick = time.monotonic()
         
         # Simulate real metrics collection
-        metric_configs = [
-            ('response_time', 150.0, 200.0, 'performance'),
-            ('success_rate', 0.97, 0.95, 'reliability'),
-            ('memory_usage', 0.65, 0.80, 'resources'),
-            ('cpu_usage', 0.55, 0.70, 'resources'),
-            ('error_rate', 0.02, 0.05, 'reliability'),
-            ('throughput', 1200.0, 1000.0, 'performance'),
-            ('agent_availability', 0.99, 0.98, 'availability'),
-            ('workflow_completion', 0.96, 0.95, 'reliability')
-        ]
-        
-        for name, value, threshold, category in metric_configs:
-            status = 'healthy' if value <= threshold else 'degraded'
+        for entry in self._metric_schedule:
+            name, value, threshold, higher_is_better, category, interval, last_polled = entry
+            if due_only:
+                if tick - last_polled < interval:
+                    continue
+                # Full snapshots don't count as a poll, so they never delay the schedule
+                entry[6] = tick
+            
+            # Floors (success rate, throughput...) breach below threshold, ceilings above
+            healthy = value >= threshold if higher_is_better else value <= threshold
+            status = 'healthy' if healthy else 'degraded'
             impact = 'low' if status == 'healthy' else 'medium'
             
             metric = HealthMetric(
@@ -130,47 +275,65 @@ class AutonomousAgentService:
                 threshold=threshold,
                 status=status,
                 timestamp=current_time,
-                impact_level=impact
+                impact_level=impact,
+                higher_is_better=higher_is_better
             )
             metrics.append(metric)
         
         return metrics
 
-    async def _detect_anomalies(self) -> List[Dict[str, Any]]:
+    async def _detect_anomalies(self, now_iso: Optional[str] = None) -> List[Anomaly]:
         """🔍 Advanced Anomaly Detection using Einstein-level AI"""
         anomalies = []
-        
-        # Pattern-based anomaly detection
-        for metric_name, metric_history in self.health_metrics.items():
-            if len(metric_history) < 10:
-                continue
-                
-            recent_values = [m.value for m in metric_history[-10:]]
-            avg_value = statistics.mean(recent_values)
-            std_dev = statistics.stdev(recent_values) if len(recent_values) > 1 else 0
+        detected_at = now_iso or datetime.now().isoformat()
+        
+        # Hybrid detection: threshold rule plus statistical score, across all metrics at once
+        if self._metric_names:
+            total, total_sq, weight = self._metric_stats.T
+            avg_values = total / weight
+            std_devs = np.sqrt(np.maximum(total_sq / weight - avg_values * avg_values, 0.0))
+            deviations = np.abs(self._latest_values - avg_values)
             
-            latest_value = recent_values[-1]
+            statistical = (self._sample_counts >= ANOMALY_MIN_SAMPLES) & (std_devs > 0)
+            deviating = statistical & (deviations > 2 * std_devs)
+            # Both signals firing on a strong deviation is critical; either alone is medium
+            critical = self._latest_degraded & statistical & (deviations > 3 * std_devs)
             
-            # Detect significant deviations
-            if std_dev > 0 and abs(latest_value - avg_value) > 2 * std_dev:
-                anomaly = {
-                    'type': 'statistical_deviation',
-                    'metric': metric_name,
-                    'current_value': latest_value,
-                    'expected_range': (avg_value - 2*std_dev, avg_value + 2*std_dev),
-                    'severity': 'high' if abs(latest_value - avg_value) > 3 * std_dev else 'medium',
-                    'detected_at': datetime.now().isoformat()
-                }
+            for row in np.flatnonzero(deviating | self._latest_degraded).tolist():
+                metric_name = self._metric_names[row]
+                severity = 'critical' if critical[row] else 'medium'
+                if deviating[row]:
+                    avg_value = float(avg_values[row])
+                    std_dev = float(std_devs[row])
+                    anomaly = Anomaly(
+                        type='statistical_deviation',
+                        severity=severity,
+                        detected_at=detected_at,
+                        metric=metric_name,
+                        current_value=float(self._latest_values[row]),
+                        expected_range=(avg_value - 2*std_dev, avg_value + 2*std_dev)
+                    )
+                else:
+                    latest = self.health_metrics[metric_name][-1]
+                    anomaly = Anomaly(
+                        type='threshold_breach',
+                        severity=severity,
+                        detected_at=detected_at,
+                        metric=metric_name,
+                        current_value=float(self._latest_values[row]),
+                        threshold=latest.threshold,
+                        description=f"{metric_name} {'below' if latest.higher_is_better else 'above'} threshold"
+                    )
                 anomalies.append(anomaly)
         
         # Time-based pattern detection
-        if await self._detect_time_based_patterns():
-            anomalies.append({
-                'type': 'time_pattern_anomaly',
-                'description': 'Unusual temporal behavior detected',
-                'severity': 'medium',
-                'detected_at': datetime.now().isoformat()
-            })
+        if self._time_pattern_detector is not None and self._time_pattern_detector():
+            anomalies.append(Anomaly(
+                type='time_pattern_anomaly',
+                severity='medium',
+                detected_at=detected_at,
+                description='Unusual temporal behavior detected'
+            ))
         
         return anomalies
 
@@ -179,29 +342,26 @@ class AutonomousAgentService:
         predictions = []
         
         # Trend analysis predictions
-        for metric_name, metric_history in self.health_metrics.items():
-            if len(metric_history) < 5:
-                continue
-                
-            recent_values = [m.value for m in metric_history[-5:]]
+        for metric_name in self._trend_ready:
+            metric_history = self.health_metrics[metric_name]
+            recent_values = [m.value for m in islice(metric_history, len(metric_history) - TREND_WINDOW, None)]
             
             # Simple trend detection
-            if len(recent_values) >= 3:
-                trend = self._calculate_trend(recent_values)
-                
-                if trend > 0.1:  # Increasing trend
-                    prediction = {
-                        'type': 'performance_degradation',
-                        'metric': metric_name,
-                        'trend': 'increasing',
-                        'predicted_timeline': '2-4 hours',
-                        'confidence': min(0.9, trend * 2),
-                        'recommended_action': f'Monitor {metric_name} closely and prepare optimization'
-                    }
-                    predictions.append(prediction)
+            trend = self._calculate_trend(recent_values)
+            
+            if trend > 0.1:  # Increasing trend
+                prediction = {
+                    'type': 'performance_degradation',
+                    'metric': metric_name,
+                    'trend': 'increasing',
+                    'predicted_timeline': '2-4 hours',
+                    'confidence': min(0.9, trend * 2),
+                    'recommended_action': f'Monitor {metric_name} closely and prepare optimization'
+                }
+                predictions.append(prediction)
         
         # Resource exhaustion prediction
-        if self._predict_resource_exhaustion():
+        if self._resource_exhaustion_predictor is not None and self._resource_exhaustion_predictor():
             predictions.append({
                 'type': 'resource_exhaustion',
                 'predicted_timeline': '30-60 minutes',
@@ -217,26 +377,29 @@ class AutonomousAgentService:
         Self-improving algorithms that enhance performance
         """
         try:
+            now = datetime.now()
             optimization_results = {
                 'optimizations_applied': [],
                 'performance_improvements': {},
                 'resource_savings': {},
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now.isoformat()
             }
             
             # Analyze current performance
-            current_metrics = await self._collect_health_metrics()
+            current_metrics = await self._collect_health_metrics(now)
             optimization_opportunities = await self._identify_optimization_opportunities(current_metrics)
             
-            # Apply autonomous optimizations
+            # Apply autonomous optimizations, recording the actions in one batch
+            applied = optimization_results['optimizations_applied']
+            actions: List[OptimizationAction] = []
             for opportunity in optimization_opportunities:
                 if opportunity['priority'] >= 8:  # High priority optimizations
-                    result = await self._apply_optimization(opportunity)
+                    result = self._apply_optimization(opportunity, now, actions)
                     if result['success']:
-                        optimization_results['optimizations_applied'].append(result)
+                        applied.append(result)
+            self.optimization_history.extend(actions)
             
-            # Measure improvements
-            await asyncio.sleep(2)  # Allow time for changes to take effect
+            # Measure improvements - strategies apply synchronously, so there is nothing to wait for
             new_metrics = await self._collect_health_metrics()
             improvements = await self._calculate_improvements(current_metrics, new_metrics)
             optimization_results['performance_improvements'] = improvements
@@ -244,7 +407,7 @@ class AutonomousAgentService:
             return optimization_results
             
         except Exception as e:
-            self.logger.error(f"Autonomous optimization failed: {e}")
+            self.logger.error("Autonomous optimization failed: %s", e)
             return {'error': str(e), 'timestamp': datetime.now().isoformat()}
 
     async def _identify_optimization_opportunities(self, metrics: List[HealthMetric]) -> List[Dict[str, Any]]:
@@ -268,136 +431,41 @@ class AutonomousAgentService:
         opportunities.sort(key=lambda x: x['priority'], reverse=True)
         return opportunities
 
-    async def _apply_optimization(self, opportunity: Dict[str, Any]) -> Dict[str, Any]:
-        """Apply specific optimization strategy"""
+    def _apply_optimization(self, opportunity: Dict[str, Any], executed_at: Optional[datetime] = None,
+                            actions: Optional[List[OptimizationAction]] = None) -> Dict[str, Any]:
+        """Apply specific optimization strategy, logging the action to actions or the history"""
         strategy_name = opportunity['strategy']
         
-        if strategy_name in self.optimization_strategies:
-            strategy_func = self.optimization_strategies[strategy_name]
-            result = await strategy_func(opportunity)
+        strategy = OPTIMIZATION_STRATEGIES.get(strategy_name)
+        if strategy is not None:
+            label, actions_taken, expected_improvement = strategy
+            result = {
+                'success': True,
+                'strategy': label,
+                'actions_taken': actions_taken,
+                'expected_improvement': expected_improvement
+            }
             
             # Log optimization action
             action = OptimizationAction(
                 action_type=strategy_name,
                 target_component=opportunity['metric'],
-                parameters=opportunity,
                 expected_impact=opportunity['estimated_impact'],
                 priority=opportunity['priority'],
-                executed_at=datetime.now()
+                current_value=opportunity.get('current_value'),
+                target_value=opportunity.get('target_value'),
+                executed_at=executed_at or datetime.now()
             )
-            self.optimization_history.append(action)
+            (self.optimization_history if actions is None else actions).append(action)
             
             return result
         else:
             return {'success': False, 'reason': 'Unknown optimization strategy'}
 
-    async def _optimize_latency(self, opportunity: Dict[str, Any]) -> Dict[str, Any]:
-        """Optimize system latency"""
-        # Implement latency optimization strategies
-        optimizations = [
-            'Enable aggressive caching',
-            'Optimize database queries',
-            'Implement connection pooling',
-            'Enable response compression'
-        ]
-        
-        return {
-            'success': True,
-            'strategy': 'latency_optimization',
-            'actions_taken': optimizations,
-            'expected_improvement': '25-40% latency reduction'
-        }
-
-    async def _optimize_error_handling(self, opportunity: Dict[str, Any]) -> Dict[str, Any]:
-        """Optimize error handling and recovery"""
-        optimizations = [
-            'Implement circuit breakers',
-            'Add retry mechanisms',
-            'Enhance error monitoring',
-            'Improve graceful degradation'
-        ]
-        
-        return {
-            'success': True,
-            'strategy': 'error_optimization',
-            'actions_taken': optimizations,
-            'expected_improvement': '50-70% error reduction'
-        }
-
-    async def _optimize_resources(self, opportunity: Dict[str, Any]) -> Dict[str, Any]:
-        """Optimize resource utilization"""
-        optimizations = [
-            'Implement auto-scaling',
-            'Optimize memory allocation',
-            'Enable resource pooling',
-            'Implement garbage collection tuning'
-        ]
-        
-        return {
-            'success': True,
-            'strategy': 'resource_optimization',
-            'actions_taken': optimizations,
-            'expected_improvement': '30-50% resource efficiency'
-        }
-
-    async def _optimize_throughput(self, opportunity: Dict[str, Any]) -> Dict[str, Any]:
-        """Optimize system throughput"""
-        optimizations = [
-            'Implement request batching',
-            'Enable parallel processing',
-            'Optimize API endpoints',
-            'Implement load balancing'
-        ]
-        
-        return {
-            'success': True,
-            'strategy': 'throughput_optimization',
-            'actions_taken': optimizations,
-            'expected_improvement': '40-60% throughput increase'
-        }
-
-    async def _handle_memory_issues(self, opportunity: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle memory-related issues"""
-        optimizations = [
-            'Force garbage collection',
-            'Clear unnecessary caches',
-            'Optimize object lifecycle',
-            'Implement memory monitoring'
-        ]
-        
-        return {
-            'success': True,
-            'strategy': 'memory_optimization',
-            'actions_taken': optimizations,
-            'expected_improvement': '20-35% memory reduction'
-        }
-
-    async def _prevent_cascade_failure(self, opportunity: Dict[str, Any]) -> Dict[str, Any]:
-        """Prevent cascade failures"""
-        optimizations = [
-            'Implement circuit breakers',
-            'Enable service isolation',
-            'Add health checks',
-            'Implement graceful degradation'
-        ]
-        
-        return {
-            'success': True,
-            'strategy': 'cascade_prevention',
-            'actions_taken': optimizations,
-            'expected_improvement': '90% cascade failure prevention'
-        }
-
     # Helper methods
-    def _map_metric_to_strategy(self, metric_name: str) -> str:
-        strategy_mapping = {
-            'response_time': 'high_latency',
-            'error_rate': 'high_error_rate',
-            'memory_usage': 'resource_exhaustion',
-            'cpu_usage': 'resource_exhaustion',
-            'throughput': 'low_throughput'
-        }
-        return strategy_mapping.get(metric_name, 'resource_exhaustion')
+    @staticmethod
+    def _map_metric_to_strategy(metric_name: str) -> str:
+        return METRIC_STRATEGIES.get(metric_name, 'resource_exhaustion')
 
     def _calculate_optimization_priority(self, metric: HealthMetric) -> int:
         base_priority = 5
@@ -425,49 +493,77 @@ class AutonomousAgentService:
             return baseline_improvement
 
     def _calculate_trend(self, values: List[float]) -> float:
-        if len(values) < 2:
+        n = len(values)
+        if n == TREND_WINDOW:
+            # Closed-form least-squares slope: centered x is (-2, -1, 0, 1, 2), sum of squares 10
+            return (2 * (values[4] - values[0]) + values[3] - values[1]) / 10.0
+        if n < 2:
             return 0.0
         
-        # Simple linear trend calculation
-        n = len(values)
+        # Least-squares slope; with centered x the sum of squares is n(n^2 - 1)/12
         x_avg = (n - 1) / 2
-        y_avg = sum(values) / n
+        denominator = n * (n * n - 1) / 12
+        if n > TREND_VECTORIZE_MIN:
+            x = np.arange(n, dtype=float)
+            x -= x_avg
+            return float(np.dot(x, np.asarray(values, dtype=float))) / denominator
         
-        numerator = sum((i - x_avg) * (values[i] - y_avg) for i in range(n))
-        denominator = sum((i - x_avg) ** 2 for i in range(n))
-        
-        return numerator / denominator if denominator != 0 else 0.0
-
-    def _predict_resource_exhaustion(self) -> bool:
-        # Simple resource exhaustion prediction
-        return False  # Placeholder for sophisticated prediction logic
-
-    async def _detect_time_based_patterns(self) -> bool:
-        # Detect unusual time-based patterns
-        return False  # Placeholder for temporal pattern detection
+        return sum((i - x_avg) * value for i, value in enumerate(values)) / denominator
 
     async def _store_health_metrics(self, metrics: List[HealthMetric]):
         """Store metrics for historical analysis"""
-        for metric in metrics:
-            if metric.metric_name not in self.health_metrics:
-                self.health_metrics[metric.metric_name] = []
-            
-            self.health_metrics[metric.metric_name].append(metric)
+        if not metrics:
+            return
+        
+        rows = np.empty(len(metrics), dtype=np.intp)
+        values = np.empty(len(metrics))
+        degraded = np.empty(len(metrics), dtype=bool)
+        for i, metric in enumerate(metrics):
+            history = self.health_metrics.get(metric.metric_name)
+            if history is None:
+                # Bounded ring - the oldest sample is evicted on append
+                history = self.health_metrics[metric.metric_name] = deque(maxlen=METRIC_HISTORY_SIZE)
             
-            # Keep only last 100 metrics per type
-            if len(self.health_metrics[metric.metric_name]) > 100:
-                self.health_metrics[metric.metric_name] = self.health_metrics[metric.metric_name][-100:]
-
-    async def _trigger_autonomous_healing(self, anomalies: List[Dict[str, Any]]):
+            history.append(metric)
+            if len(history) == TREND_WINDOW:
+                self._trend_ready.append(metric.metric_name)
+            rows[i] = self._metric_row(metric.metric_name)
+            values[i] = metric.value
+            degraded[i] = metric.status == 'degraded'
+        
+        # Fold the samples into the decayed running statistics
+        stats = self._metric_stats[rows]
+        stats *= ANOMALY_STATS_DECAY
+        stats[:, 0] += values
+        stats[:, 1] += values * values
+        stats[:, 2] += 1.0
+        self._metric_stats[rows] = stats
+        self._latest_values[rows] = values
+        self._latest_degraded[rows] = degraded
+        self._sample_counts[rows] += 1
+
+    def _metric_row(self, metric_name: str) -> int:
+        """Row of a metric in the statistics arrays, allocated on first sight"""
+        row = self._metric_rows.get(metric_name)
+        if row is None:
+            row = self._metric_rows[metric_name] = len(self._metric_names)
+            self._metric_names.append(metric_name)
+            self._metric_stats = np.vstack((self._metric_stats, np.zeros((1, 3))))
+            self._latest_values = np.append(self._latest_values, 0.0)
+            self._latest_degraded = np.append(self._latest_degraded, False)
+            self._sample_counts = np.append(self._sample_counts, 0)
+        return row
+
+    async def _trigger_autonomous_healing(self, anomalies: List[Anomaly]):
         """Trigger autonomous healing based on detected anomalies"""
         for anomaly in anomalies:
-            if anomaly['severity'] in ['high', 'critical']:
-                self.logger.warning(f"Triggering autonomous healing for: {anomaly}")
+            if anomaly.severity in ('high', 'critical'):
+                self.logger.warning("Triggering autonomous healing for: %r", anomaly)
                 
                 # Apply appropriate healing strategy
                 await self._apply_healing_strategy(anomaly)
 
-    async def _apply_healing_strategy(self, anomaly: Dict[str, Any]):
+    async def _apply_healing_strategy(self, anomaly: Anomaly):
         """Apply specific healing strategy for anomaly"""
         healing_strategies = {
             'statistical_deviation': self._heal_statistical_deviation,
@@ -475,61 +571,49 @@ class AutonomousAgentService:
             'resource_exhaustion': self._heal_resource_issues
         }
         
-        strategy = healing_strategies.get(anomaly['type'])
+        strategy = healing_strategies.get(anomaly.type)
         if strategy:
             await strategy(anomaly)
 
-    async def _heal_statistical_deviation(self, anomaly: Dict[str, Any]):
+    async def _heal_statistical_deviation(self, anomaly: Anomaly):
         """Heal statistical deviations"""
-        metric_name = anomaly.get('metric')
-        if metric_name in self.optimization_strategies:
+        metric_name = anomaly.metric
+        if metric_name in OPTIMIZATION_STRATEGIES:
             opportunity = {
                 'metric': metric_name,
                 'strategy': self._map_metric_to_strategy(metric_name),
                 'priority': 9,
                 'estimated_impact': 0.3
             }
-            await self._apply_optimization(opportunity)
+            self._apply_optimization(opportunity)
 
-    async def _heal_temporal_anomaly(self, anomaly: Dict[str, Any]):
+    async def _heal_temporal_anomaly(self, anomaly: Anomaly):
         """Heal temporal anomalies"""
         # Implement temporal healing strategies
         pass
 
-    async def _heal_resource_issues(self, anomaly: Dict[str, Any]):
+    async def _heal_resource_issues(self, anomaly: Anomaly):
         """Heal resource-related issues"""
         # Implement resource healing strategies
         pass
 
     async def _calculate_improvements(self, before_metrics: List[HealthMetric], after_metrics: List[HealthMetric]) -> Dict[str, float]:
         """Calculate performance improvements after optimization"""
-        improvements = {}
-        
-        before_dict = {m.metric_name: m.value for m in before_metrics}
         after_dict = {m.metric_name: m.value for m in after_metrics}
+        names = [m.metric_name for m in before_metrics]
         
-        for metric_name in before_dict:
-            if metric_name in after_dict:
-                before_val = before_dict[metric_name]
-                after_val = after_dict[metric_name]
-                
-                if before_val != 0:
-                    improvement = ((before_val - after_val) / before_val) * 100
-                    improvements[metric_name] = round(improvement, 2)
+        # Align both snapshots on the before metrics; NaN marks metrics missing afterwards
+        before_vals = np.fromiter((m.value for m in before_metrics), dtype=float, count=len(names))
+        after_vals = np.fromiter((after_dict.get(name, np.nan) for name in names), dtype=float, count=len(names))
         
-        return improvements
+        valid = (before_vals != 0) & ~np.isnan(after_vals)
+        improvements = np.round((before_vals - after_vals) / np.where(valid, before_vals, 1.0) * 100, 2)
+        
+        return {name: value for name, value, ok in zip(names, improvements.tolist(), valid.tolist()) if ok}
 
-    async def _generate_health_recommendations(self) -> List[str]:
+    async def _generate_health_recommendations(self) -> Tuple[str, ...]:
         """Generate AI-driven health recommendations"""
-        recommendations = [
-            "🔍 Enable predictive monitoring for proactive issue detection",
-            "⚡ Implement auto-scaling based on demand patterns",
-            "🛡️ Deploy circuit breakers for critical service dependencies",
-            "📊 Set up real-time performance dashboards",
-            "🔄 Configure automated backup and recovery procedures"
-        ]
-        
-        return recommendations
+        return HEALTH_RECOMMENDATIONS
 
 # Export the service
 autonomous_agent_service = AutonomousAgentService()
\ No newline at end of file
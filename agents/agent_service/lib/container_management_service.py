@@ -4,16 +4,123 @@
 # ============================================================
 
 import asyncio
+import base64
+import codecs
 import logging
+import io
+import os
+import posixpath
+import shlex
+import struct
+import tarfile
+import threading
 import time
 import json
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass
+
+import numpy as np
+
+try:
+    import docker
+except ImportError:
+    docker = None
 
 # Setup logging
 logger = logging.getLogger("container_service")
 
-@dataclass
+# Labels used to find Genesis containers on the Docker host
+AGENT_LABEL = "genesis.agent_id"
+MANAGED_LABEL = "genesis.managed"
+
+# Warm pool of pre-started containers claimed by new agents
+WARM_POOL_SIZE = int(os.getenv("GENESIS_WARM_POOL_SIZE", "4"))
+WARM_POOL_IMAGE = os.getenv("GENESIS_WARM_POOL_IMAGE", "genesis-agent:latest")
+WARM_AGENT_ID = "__warm__"
+WARM_AGENT_ENV_FILE = "/tmp/genesis-agent.env"
+
+# Warm containers hold the image's command until a claim writes the agent's
+# environment, then load it and hand over to that command
+WARM_ENTRYPOINT = (
+    f'while [ ! -f {WARM_AGENT_ENV_FILE} ]; do sleep 0.05; done; '
+    f'. {WARM_AGENT_ENV_FILE}; exec "$@"'
+)
+
+# Worker threads reserved for blocking docker-py calls; this also caps the
+# number of Docker API requests in flight at once
+DOCKER_EXECUTOR_WORKERS = int(os.getenv("GENESIS_DOCKER_WORKERS", "32"))
+
+# Maximum concurrent stop/remove operations during bulk cleanup, kept within
+# the executor so cleanup can't starve other Docker calls of workers
+CLEANUP_CONCURRENCY = max(1, min(16, DOCKER_EXECUTOR_WORKERS // 2))
+
+# Finished teardowns kept around for status lookups
+MAX_TEARDOWN_RESULTS = 1000
+
+# Persistent shell sessions reused across execute_command calls
+MAX_EXEC_SESSIONS = int(os.getenv("GENESIS_MAX_EXEC_SESSIONS", "64"))
+EXEC_SESSION_TIMEOUT = 300  # seconds a single command may run
+
+# How long a fetched container status is reused (Docker emits stats ~1/s)
+STATUS_CACHE_TTL = 1.0  # seconds
+
+# Live stats streams, each holding one default-executor thread
+MAX_STATS_STREAMS = int(os.getenv("GENESIS_MAX_STATS_STREAMS", "32"))
+
+# Keep-alive connections to the Docker socket shared by every call: one per
+# executor worker and stats stream, plus the events stream
+DOCKER_POOL_SIZE = int(os.getenv(
+    "GENESIS_DOCKER_POOL_SIZE",
+    str(DOCKER_EXECUTOR_WORKERS + MAX_STATS_STREAMS + 1)
+))
+
+# Seccomp profile for browser containers: allows everything Chromium's sandbox
+# needs but denies io_uring and host-administration syscalls
+BROWSER_SECCOMP_PATH = os.getenv(
+    "GENESIS_BROWSER_SECCOMP",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "genesis-browser-seccomp.json")
+)
+
+def load_seccomp_profile(path: str) -> str:
+    """Load a seccomp profile as the compact JSON the Docker API expects inline"""
+    try:
+        with open(path) as profile:
+            return json.dumps(json.load(profile), separators=(',', ':'))
+    except (OSError, ValueError) as e:
+        # Keep browser containers working as before if the profile is unavailable
+        logger.warning("⚠️ Browser seccomp profile unavailable, running unconfined: %s", e)
+        return "unconfined"
+
+BROWSER_SECURITY_OPT = [f"seccomp={load_seccomp_profile(BROWSER_SECCOMP_PATH)}"]
+
+# Genesis network address pool, built on first network creation
+GENESIS_NETWORK_SUBNET = "172.20.0.0/16"
+_ipam_config = None
+
+def genesis_ipam_config():
+    """IPAM config for the Genesis network, validated by the SDK only once"""
+    global _ipam_config
+    if _ipam_config is None:
+        _ipam_config = docker.types.IPAMConfig(
+            pool_configs=[docker.types.IPAMPool(subnet=GENESIS_NETWORK_SUBNET)]
+        )
+    return _ipam_config
+
+# Docker container states mapped onto tracked statuses
+DOCKER_STATE_MAP = {
+    'created': 'created',
+    'running': 'running',
+    'restarting': 'running',
+    'paused': 'stopped',
+    'exited': 'stopped',
+    'dead': 'error'
+}
+
+@dataclass(slots=True)
 class ContainerConfig:
     image: str
     environment: Dict[str, str]
@@ -23,43 +130,245 @@ class ContainerConfig:
     volumes: Dict[str, str] = None
     ports: Dict[str, str] = None
 
-@dataclass
+@dataclass(slots=True)
 class ContainerStatus:
     container_id: str
     agent_id: str
-    status: str  # 'created', 'running', 'stopped', 'error'
+    status: str  # 'created', 'running', 'stopping', 'stopped', 'error'
     created_at: float
     started_at: Optional[float] = None
     stopped_at: Optional[float] = None
     resource_usage: Dict[str, Any] = None
     health_status: str = 'unknown'
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Flat field copy; the fields are scalars, so asdict's deep copy buys nothing"""
+        return {
+            'container_id': self.container_id,
+            'agent_id': self.agent_id,
+            'status': self.status,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'stopped_at': self.stopped_at,
+            'resource_usage': self.resource_usage,
+            'health_status': self.health_status
+        }
+
+def container_suffix() -> str:
+    """Nanosecond timestamp as short lowercase base32, unique across rapid successive creates"""
+    return base64.b32encode(time.time_ns().to_bytes(8, 'big')).decode('ascii').rstrip('=').lower()
+
+@lru_cache(maxsize=256)
+def joined_command(command: Tuple[str, ...]) -> str:
+    """Space-joined command line, memoized for repeated probes like health checks"""
+    return ' '.join(command)
+
+def sample_usage(stats: Dict[str, Any]) -> Tuple[int, float, int]:
+    """Reduce a raw Docker stats sample to (memory bytes, CPU percent, network bytes)"""
+    # Calculate memory usage
+    memory_usage = stats.get('memory_stats', {}).get('usage', 0)
+    
+    # Calculate CPU usage
+    cpu_stats = stats.get('cpu_stats', {})
+    precpu_stats = stats.get('precpu_stats', {})
+    cpu_delta = cpu_stats.get('cpu_usage', {}).get('total_usage', 0) - \
+               precpu_stats.get('cpu_usage', {}).get('total_usage', 0)
+    system_delta = cpu_stats.get('system_cpu_usage', 0) - \
+                  precpu_stats.get('system_cpu_usage', 0)
+    cpu_percent = (cpu_delta / system_delta) * 100.0 if system_delta > 0 else 0.0
+    
+    # Calculate network usage
+    network_usage = sum(
+        net['rx_bytes'] + net['tx_bytes'] 
+        for net in stats['networks'].values()
+    ) if 'networks' in stats else 0
+    
+    return memory_usage, cpu_percent, network_usage
+
+def summarize_stats(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a raw Docker stats sample to a memory/cpu/network dict"""
+    memory_usage, cpu_percent, network_usage = sample_usage(stats)
+    return {
+        'memory': memory_usage,
+        'cpu': cpu_percent,
+        'network': network_usage
+    }
+
+def warm_env_file(environment: Dict[str, str]) -> str:
+    """Shell-sourceable handover file exporting an agent's environment"""
+    return ''.join(f"export {key}={shlex.quote(str(value))}\n" for key, value in environment.items())
+
+def read_claimed_agent_id(container) -> Optional[str]:
+    """Agent id from a warm container's handover file, or None if it was never claimed"""
+    try:
+        chunks, _ = container.get_archive(WARM_AGENT_ENV_FILE)
+        with tarfile.open(fileobj=io.BytesIO(b''.join(chunks))) as tar:
+            member = tar.next()
+            content = tar.extractfile(member).read().decode('utf-8') if member else ''
+    except Exception:
+        return None
+    
+    for line in content.splitlines():
+        key, _, value = line.removeprefix('export ').partition('=')
+        if key == 'AGENT_ID' and value:
+            return shlex.split(value)[0]
+    return None
+
+class ExecSession:
+    """Long-lived `sh` exec attached over the Docker socket.
+    
+    Commands are written to the shell's stdin followed by a marker line
+    carrying the exit code, so one exec serves every command for an agent.
+    Methods block on the socket and must run on the Docker executor.
+    """
+    
+    def __init__(self, docker_client, container_id: str):
+        # Claimed warm containers carry the agent's environment in the handover file
+        exec_id = docker_client.api.exec_create(
+            container_id,
+            ["sh", "-c", f'[ -f {WARM_AGENT_ENV_FILE} ] && . {WARM_AGENT_ENV_FILE}; exec sh'],
+            stdin=True,
+            stdout=True,
+            stderr=True,
+            tty=False
+        )['Id']
+        socket_io = docker_client.api.exec_start(exec_id, socket=True)
+        self._sock = getattr(socket_io, '_sock', socket_io)
+        self._sock.settimeout(EXEC_SESSION_TIMEOUT)
+        self._buffer = b''
+        self.lock = asyncio.Lock()
+    
+    def _recv_exact(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            chunk = self._sock.recv(65536)
+            if not chunk:
+                raise ConnectionError("Exec session closed")
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+    
+    def run(self, command: List[str]) -> Dict[str, Any]:
+        """Run a command in the shell and wait for its exit marker"""
+        marker = f"__GENESIS_EXIT_{uuid.uuid4().hex}__"
+        # Subshell keeps exit/cd/exports from leaking into the session; closed
+        # stdin stops the command from swallowing the marker line
+        line = f"( {shlex.join(command)} ) </dev/null\nprintf '\\n{marker}:%s\\n' $?\n"
+        self._sock.sendall(line.encode('utf-8'))
+        
+        stdout = bytearray()
+        stderr = bytearray()
+        marker_bytes = f"\n{marker}:".encode('utf-8')
+        
+        while True:
+            # Multiplexed stream frame: 1 byte stream type, 3 pad, 4 byte size
+            stream_type, size = struct.unpack('>BxxxL', self._recv_exact(8))
+            payload = self._recv_exact(size)
+            (stderr if stream_type == 2 else stdout).extend(payload)
+            
+            index = stdout.find(marker_bytes)
+            if index != -1 and stdout.endswith(b'\n'):
+                exit_code = int(stdout[index + len(marker_bytes):].strip() or 1)
+                return {
+                    'stdout': stdout[:index].decode('utf-8', errors='replace'),
+                    'stderr': stderr.decode('utf-8', errors='replace'),
+                    'exitCode': exit_code
+                }
+    
+    def close(self):
+        try:
+            self._sock.close()
+        except Exception:
+            pass
 
 class ContainerManagementService:
     """Real Docker container management for Genesis agents"""
     
     def __init__(self):
         self.containers: Dict[str, ContainerStatus] = {}
+        self.agent_index: Dict[str, str] = {}  # agent_id -> container_id
+        self._listing: List[Dict[str, Any]] = []
+        self._listing_dirty = True  # set on tracking changes and status transitions
         self.docker_client = None
+        self._handles: Dict[str, Any] = {}  # container_id -> docker-py Container
+        self._event_stream = None
+        self._event_task: Optional[asyncio.Task] = None
+        self._warm_pool: asyncio.Queue = asyncio.Queue()
+        self._warm_pool_config = ContainerConfig(
+            image=WARM_POOL_IMAGE,
+            environment={},
+            resources={"memory": 512, "cpus": 1, "disk": 1024},
+            capabilities=["browser", "terminal", "file_system"],
+            networks=["genesis-network"]
+        )
+        self._refill_task: Optional[asyncio.Task] = None
+        self._exec_sessions: "OrderedDict[str, ExecSession]" = OrderedDict()
+        self._status_cache: Dict[str, tuple] = {}  # container_id -> (fetched_at, status)
+        self._status_inflight: Dict[str, asyncio.Future] = {}
+        # Latest stream sample per container, stored column-wise by slot
+        self._stats_slots: Dict[str, int] = {}  # container_id -> slot
+        self._free_stats_slots = list(range(MAX_STATS_STREAMS - 1, -1, -1))
+        self._stats_memory = np.zeros(MAX_STATS_STREAMS, dtype=np.int64)
+        self._stats_cpu = np.zeros(MAX_STATS_STREAMS, dtype=np.float64)
+        self._stats_network = np.zeros(MAX_STATS_STREAMS, dtype=np.int64)
+        self._stats_streams: Dict[str, tuple] = {}  # container_id -> (task, stop flag)
+        self._cpu_samples: Dict[str, Dict[str, Any]] = {}  # container_id -> last one-shot cpu_stats
+        self._teardown_queue: asyncio.Queue = asyncio.Queue()
+        self._teardown_workers: List[asyncio.Task] = []
+        self._teardown_results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._discard_tasks: set = set()  # removals of warm containers that failed a claim
+        self.pool_hits = 0
+        self.pool_misses = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=DOCKER_EXECUTOR_WORKERS,
+            thread_name_prefix="docker"
+        )
         logger.info("🐳 Container Management Service initializing...")
         
     async def initialize(self):
         """Initialize Docker client"""
+        if self.docker_client is not None:
+            # One long-lived client per process; reconnecting would orphan its pool
+            return
+        
+        if docker is None:
+            logger.warning("⚠️ docker SDK not installed, running in simulation mode")
+            return
+        
         try:
-            import docker
-            self.docker_client = docker.from_env()
+            self.docker_client = await self._run(docker.from_env, max_pool_size=DOCKER_POOL_SIZE)
             
             # Test Docker connection
-            self.docker_client.ping()
+            await self._run(self.docker_client.ping)
             logger.info("✅ Docker client connected successfully")
             
             # Create Genesis network if it doesn't exist
             await self._ensure_genesis_network()
             
+            # Seed the container cache once, then keep it fresh from the events stream
+            await self._sync_containers()
+            self._event_task = asyncio.create_task(self._watch_events())
+            
+            # Pre-start idle containers so new agents skip the cold start
+            self._schedule_pool_refill()
+            
         except Exception as e:
-            logger.error(f"❌ Failed to initialize Docker client: {e}")
+            logger.error("❌ Failed to initialize Docker client: %s", e)
             # Fallback to simulation mode
             self.docker_client = None
     
+    async def _run(self, fn, *args, **kwargs):
+        """Run a blocking docker-py call on the Docker executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+    
+    async def _get_container(self, container_id: str):
+        """Get the Docker handle for a container, looking it up only on a cache miss"""
+        container = self._handles.get(container_id)
+        if container is None:
+            container = await self._run(self.docker_client.containers.get, container_id)
+            self._handles[container_id] = container
+        return container
+    
     async def _ensure_genesis_network(self):
         """Ensure Genesis network exists"""
         try:
@@ -67,32 +376,199 @@ class ContainerManagementService:
             
             # Check if network exists
             try:
-                self.docker_client.networks.get(network_name)
-                logger.info(f"✅ Genesis network '{network_name}' already exists")
+                await self._run(self.docker_client.networks.get, network_name)
+                logger.info("✅ Genesis network '%s' already exists", network_name)
             except:
                 # Create the network
-                network = self.docker_client.networks.create(
+                network = await self._run(
+                    self.docker_client.networks.create,
                     network_name,
                     driver="bridge",
-                    ipam=docker.types.IPAMConfig(
-                        pool_configs=[docker.types.IPAMPool(
-                            subnet="172.20.0.0/16"
-                        )]
-                    )
+                    ipam=genesis_ipam_config()
                 )
-                logger.info(f"✅ Created Genesis network '{network_name}': {network.id}")
+                logger.info("✅ Created Genesis network '%s': %s", network_name, network.id)
                 
         except Exception as e:
-            logger.error(f"❌ Failed to ensure Genesis network: {e}")
+            logger.error("❌ Failed to ensure Genesis network: %s", e)
+    
+    async def _sync_containers(self):
+        """Seed tracked containers with a single bulk list call"""
+        try:
+            containers = await self._run(
+                self.docker_client.containers.list,
+                all=True,
+                filters={"label": MANAGED_LABEL}
+            )
+            
+            # Claimed warm containers only record their agent in the handover file
+            warm = [c for c in containers if c.labels.get(MANAGED_LABEL) == "warm" and c.name not in self.containers]
+            claimed = await asyncio.gather(*(self._run(read_claimed_agent_id, c) for c in warm))
+            claimed_agents = {c.name: agent_id for c, agent_id in zip(warm, claimed)}
+            
+            for container in containers:
+                container_id = container.name
+                agent_id = container.labels.get(AGENT_LABEL) or claimed_agents.get(container_id)
+                if container_id in self.containers or not agent_id:
+                    continue
+                
+                self._track_container(ContainerStatus(
+                    container_id=container_id,
+                    agent_id=agent_id,
+                    status=DOCKER_STATE_MAP.get(container.status, 'stopped'),
+                    created_at=time.time(),
+                    health_status='healthy' if container.status == 'running' else 'unknown'
+                ))
+                
+                if container.status == 'running':
+                    self._start_stats_stream(container_id)
+            
+            logger.info("✅ Container cache seeded with %s containers", len(self.containers))
+            
+        except Exception as e:
+            logger.error("❌ Failed to seed container cache: %s", e)
+    
+    async def _watch_events(self):
+        """Apply Docker container events to the tracked containers"""
+        loop = asyncio.get_running_loop()
+        
+        def consume():
+            self._event_stream = self.docker_client.events(
+                decode=True,
+                filters={"type": "container", "label": MANAGED_LABEL}
+            )
+            for event in self._event_stream:
+                loop.call_soon_threadsafe(self._apply_event, event)
+        
+        try:
+            await asyncio.to_thread(consume)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("❌ Docker events watcher stopped: %s", e)
+    
+    def _apply_event(self, event: Dict[str, Any]):
+        """Apply a single Docker event delta to the container cache"""
+        attributes = event.get('Actor', {}).get('Attributes', {})
+        container_id = attributes.get('name')
+        action = event.get('Action') or event.get('status')
+        
+        container_status = self.containers.get(container_id)
+        if not container_status:
+            return
+        
+        if action == 'start':
+            container_status.status = 'running'
+            container_status.started_at = container_status.started_at or time.time()
+            container_status.health_status = 'healthy'
+            self._start_stats_stream(container_id)
+        elif action in ('die', 'stop', 'kill', 'oom'):
+            container_status.status = 'stopped'
+            container_status.stopped_at = time.time()
+            container_status.health_status = 'unhealthy'
+            self._stop_stats_stream(container_id)
+        elif action == 'destroy':
+            self._untrack_container(container_id)
+            return
+        else:
+            return
+        self._listing_dirty = True
+    
+    def _start_stats_stream(self, container_id: str):
+        """Follow a running container's stats stream into the stats arrays"""
+        if not self.docker_client or container_id in self._stats_streams:
+            return
+        if len(self._stats_streams) >= MAX_STATS_STREAMS:
+            # Status requests for this container fall back to a one-off stats call
+            return
+        
+        loop = asyncio.get_running_loop()
+        stop = threading.Event()
+        
+        def store(sample: Dict[str, Any]):
+            if stop.is_set():
+                return
+            slot = self._stats_slots.get(container_id)
+            if slot is None:
+                slot = self._stats_slots[container_id] = self._free_stats_slots.pop()
+            (self._stats_memory[slot],
+             self._stats_cpu[slot],
+             self._stats_network[slot]) = sample_usage(sample)
+        
+        def consume():
+            container = self._handles.get(container_id) or self.docker_client.containers.get(container_id)
+            # Docker emits one sample per second; the stop flag is checked on each
+            for sample in container.stats(stream=True, decode=True):
+                if stop.is_set():
+                    break
+                loop.call_soon_threadsafe(store, sample)
+        
+        async def follow():
+            try:
+                await asyncio.to_thread(consume)
+            except Exception as e:
+                logger.debug("Stats stream for %s ended: %s", container_id, e)
+            finally:
+                if not stop.is_set():
+                    self._stop_stats_stream(container_id)
+        
+        self._stats_streams[container_id] = (asyncio.create_task(follow()), stop)
+    
+    def _stop_stats_stream(self, container_id: str):
+        """Stop following a container's stats stream"""
+        stream = self._stats_streams.pop(container_id, None)
+        slot = self._stats_slots.pop(container_id, None)
+        if slot is not None:
+            self._free_stats_slots.append(slot)
+        if stream:
+            task, stop = stream
+            stop.set()
+            task.cancel()
+    
+    async def close(self):
+        """Stop the events watcher and release the Docker client"""
+        for container_id in list(self._stats_streams):
+            self._stop_stats_stream(container_id)
+        
+        if self._event_stream is not None:
+            self._event_stream.close()
+            self._event_stream = None
+        
+        if self._event_task is not None:
+            self._event_task.cancel()
+            self._event_task = None
+        
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            self._refill_task = None
+        
+        for worker in self._teardown_workers:
+            worker.cancel()
+        self._teardown_workers = []
+        
+        # Unclaimed warm containers are not tracked anywhere else
+        while not self._warm_pool.empty():
+            container_status = self._warm_pool.get_nowait()
+            try:
+                container = await self._get_container(container_status.container_id)
+                await self._run(container.remove, force=True)
+            except Exception as e:
+                logger.error("Failed to remove warm container %s: %s", container_status.container_id, e)
+        self._handles.clear()
+        
+        if self.docker_client:
+            await self._run(self.docker_client.close)
+            self.docker_client = None
+        
+        self._executor.shutdown(wait=False)
     
     async def create_agent_container(self, agent_id: str, config: ContainerConfig) -> str:
         """Create a new container for an agent"""
-        container_id = f"genesis-agent-{agent_id}-{int(time.time())}"
+        container_id = f"genesis-agent-{agent_id}-{container_suffix()}"
         
         try:
             if not self.docker_client:
                 # Simulation mode
-                logger.info(f"🎭 [SIMULATION] Creating container {container_id}")
+                logger.info("🎭 [SIMULATION] Creating container %s", container_id)
                 container_status = ContainerStatus(
                     container_id=container_id,
                     agent_id=agent_id,
@@ -100,39 +576,17 @@ class ContainerManagementService:
                     created_at=time.time(),
                     health_status='healthy'
                 )
-                self.containers[container_id] = container_status
+                self._track_container(container_status)
                 return container_id
             
-            logger.info(f"🐳 Creating real Docker container: {container_id}")
+            logger.info("🐳 Creating real Docker container: %s", container_id)
             
-            # Prepare container configuration
-            environment = {
-                'AGENT_ID': agent_id,
-                'CONTAINER_ID': container_id,
-                'GENESIS_MODE': 'production',
-                **config.environment
-            }
-            
-            # Resource limits
-            mem_limit = config.resources.get('memory', 512) * 1024 * 1024  # Convert MB to bytes
-            cpu_limit = config.resources.get('cpus', 1)
-            
-            # Security capabilities for browser automation
-            cap_add = ['SYS_ADMIN', 'NET_ADMIN'] if 'browser' in config.capabilities else []
-            
-            # Create container
-            container = self.docker_client.containers.create(
-                image=config.image,
-                name=container_id,
-                environment=environment,
-                mem_limit=mem_limit,
-                nano_cpus=int(cpu_limit * 1e9),  # Convert to nanocpus
-                cap_add=cap_add,
-                security_opt=['seccomp:unconfined'] if 'browser' in config.capabilities else [],
-                network='genesis-network',
-                detach=True,
-                stdin_open=True,
-                tty=True
+            # Keep the handle so start/stop/remove skip a containers.get round trip
+            self._handles[container_id] = await self._create_docker_container(
+                container_id,
+                agent_id,
+                config,
+                labels={MANAGED_LABEL: "agent", AGENT_LABEL: agent_id}
             )
             
             # Store container status
@@ -143,15 +597,167 @@ class ContainerManagementService:
                 created_at=time.time(),
                 health_status='healthy'
             )
-            self.containers[container_id] = container_status
+            self._track_container(container_status)
             
-            logger.info(f"✅ Container created: {container_id}")
+            logger.info("✅ Container created: %s", container_id)
             return container_id
             
         except Exception as e:
-            logger.error(f"❌ Failed to create container {container_id}: {e}")
+            logger.error("❌ Failed to create container %s: %s", container_id, e)
             raise Exception(f"Container creation failed: {str(e)}")
     
+    async def _create_docker_container(self, container_id: str, agent_id: str,
+                                       config: ContainerConfig, labels: Dict[str, str],
+                                       **overrides):
+        """Create the Docker container backing an agent or warm pool slot"""
+        # Prepare container configuration
+        environment = {
+            'AGENT_ID': agent_id,
+            'CONTAINER_ID': container_id,
+            'GENESIS_MODE': 'production',
+            **config.environment
+        }
+        
+        # Resource limits
+        mem_limit = config.resources.get('memory', 512) * 1024 * 1024  # Convert MB to bytes
+        cpu_limit = config.resources.get('cpus', 1)
+        
+        # Security capabilities for browser automation
+        cap_add = ['SYS_ADMIN', 'NET_ADMIN'] if 'browser' in config.capabilities else []
+        
+        # Create container
+        return await self._run(
+            self.docker_client.containers.create,
+            image=config.image,
+            name=container_id,
+            environment=environment,
+            mem_limit=mem_limit,
+            nano_cpus=int(cpu_limit * 1e9),  # Convert to nanocpus
+            cap_add=cap_add,
+            security_opt=BROWSER_SECURITY_OPT if 'browser' in config.capabilities else [],
+            labels=labels,
+            network='genesis-network',
+            detach=True,
+            stdin_open=True,
+            tty=True,
+            **overrides
+        )
+    
+    def _schedule_pool_refill(self):
+        """Top the warm pool back up in the background"""
+        if not self.docker_client or WARM_POOL_SIZE <= 0:
+            return
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self._refill_pool())
+    
+    async def _refill_pool(self):
+        """Keep WARM_POOL_SIZE idle containers created and started"""
+        while self.docker_client and self._warm_pool.qsize() < WARM_POOL_SIZE:
+            container_id = f"genesis-warm-{container_suffix()}"
+            container = None
+            try:
+                # Wrap the image's own command so it starts with the claimed agent's environment
+                image = await self._run(self.docker_client.images.get, self._warm_pool_config.image)
+                image_config = image.attrs.get('Config') or {}
+                command = (image_config.get('Entrypoint') or []) + (image_config.get('Cmd') or [])
+                
+                container = await self._create_docker_container(
+                    container_id,
+                    WARM_AGENT_ID,
+                    self._warm_pool_config,
+                    labels={MANAGED_LABEL: "warm"},
+                    entrypoint=["sh", "-c", WARM_ENTRYPOINT, "sh"],
+                    command=command
+                )
+                await self._run(container.start)
+                self._handles[container_id] = container
+                
+                now = time.time()
+                self._warm_pool.put_nowait(ContainerStatus(
+                    container_id=container_id,
+                    agent_id=WARM_AGENT_ID,
+                    status='running',
+                    created_at=now,
+                    started_at=now,
+                    health_status='healthy'
+                ))
+                logger.info("♨️ Warm container ready: %s (pool size: %s)", container_id, self._warm_pool.qsize())
+                
+            except Exception as e:
+                # Don't spin on a missing image or an unavailable daemon
+                logger.error("❌ Failed to refill warm pool: %s", e)
+                if container is not None:
+                    try:
+                        await self._run(container.remove, force=True)
+                    except Exception as remove_error:
+                        logger.error("Failed to remove warm container %s: %s", container_id, remove_error)
+                    self._handles.pop(container_id, None)
+                return
+    
+    def _matches_warm_pool(self, config: ContainerConfig) -> bool:
+        """Check whether a warm container can serve this config"""
+        pool_config = self._warm_pool_config
+        # Environment is not compared: the claim hands it over in full
+        return (
+            config.image == pool_config.image
+            and config.resources == pool_config.resources
+            and sorted(config.capabilities) == sorted(pool_config.capabilities)
+            and (config.networks or ["genesis-network"]) == pool_config.networks
+        )
+    
+    async def claim_warm_container(self, agent_id: str, config: ContainerConfig) -> Optional[str]:
+        """Claim a pre-started container for an agent, or None on a pool miss"""
+        if not self.docker_client or not self._matches_warm_pool(config) or self._warm_pool.empty():
+            self.pool_misses += 1
+            return None
+        
+        container_status = self._warm_pool.get_nowait()
+        container_id = container_status.container_id
+        self._schedule_pool_refill()
+        
+        try:
+            # Environment is fixed at create time, so hand it over via the file the
+            # entrypoint waits on; written then renamed so it is never read half-done
+            environment = {**config.environment, 'AGENT_ID': agent_id}
+            container = await self._get_container(container_id)
+            result = await self._run(
+                container.exec_run,
+                cmd=[
+                    "sh", "-c",
+                    f'printf %s "$1" > {WARM_AGENT_ENV_FILE}.tmp && mv {WARM_AGENT_ENV_FILE}.tmp {WARM_AGENT_ENV_FILE}',
+                    "sh", warm_env_file(environment)
+                ]
+            )
+            if result.exit_code != 0:
+                raise Exception(f"handover exited with {result.exit_code}")
+        except Exception as e:
+            logger.error("❌ Failed to claim warm container %s: %s", container_id, e)
+            self.pool_misses += 1
+            # Already out of the pool and never tracked, so nothing else would remove it
+            task = asyncio.create_task(self.remove_container(container_id))
+            self._discard_tasks.add(task)
+            task.add_done_callback(self._discard_tasks.discard)
+            return None
+        
+        container_status.agent_id = agent_id
+        self._track_container(container_status)
+        self._start_stats_stream(container_id)
+        self.pool_hits += 1
+        
+        logger.info("♨️ Agent %s claimed warm container %s", agent_id, container_id)
+        return container_id
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get warm pool size and hit ratio"""
+        claims = self.pool_hits + self.pool_misses
+        return {
+            'size': self._warm_pool.qsize(),
+            'target_size': WARM_POOL_SIZE,
+            'hits': self.pool_hits,
+            'misses': self.pool_misses,
+            'hit_ratio': self.pool_hits / claims if claims else 0.0
+        }
+    
     async def start_container(self, container_id: str) -> bool:
         """Start a container"""
         try:
@@ -161,27 +767,30 @@ class ContainerManagementService:
             
             if not self.docker_client:
                 # Simulation mode
-                logger.info(f"🎭 [SIMULATION] Starting container {container_id}")
+                logger.info("🎭 [SIMULATION] Starting container %s", container_id)
                 container_status.status = 'running'
                 container_status.started_at = time.time()
+                self._listing_dirty = True
                 return True
             
-            logger.info(f"🚀 Starting real Docker container: {container_id}")
+            logger.info("🚀 Starting real Docker container: %s", container_id)
             
-            container = self.docker_client.containers.get(container_id)
-            container.start()
+            container = await self._get_container(container_id)
+            await self._run(container.start)
             
             # Update status
             container_status.status = 'running'
             container_status.started_at = time.time()
+            self._listing_dirty = True
             
-            logger.info(f"✅ Container started: {container_id}")
+            logger.info("✅ Container started: %s", container_id)
             return True
             
         except Exception as e:
-            logger.error(f"❌ Failed to start container {container_id}: {e}")
+            logger.error("❌ Failed to start container %s: %s", container_id, e)
             if container_id in self.containers:
                 self.containers[container_id].status = 'error'
+                self._listing_dirty = True
             return False
     
     async def stop_container(self, container_id: str) -> bool:
@@ -193,25 +802,28 @@ class ContainerManagementService:
             
             if not self.docker_client:
                 # Simulation mode
-                logger.info(f"🎭 [SIMULATION] Stopping container {container_id}")
+                logger.info("🎭 [SIMULATION] Stopping container %s", container_id)
                 container_status.status = 'stopped'
                 container_status.stopped_at = time.time()
+                self._listing_dirty = True
                 return True
             
-            logger.info(f"🛑 Stopping real Docker container: {container_id}")
+            logger.info("🛑 Stopping real Docker container: %s", container_id)
             
-            container = self.docker_client.containers.get(container_id)
-            container.stop(timeout=10)
+            self._close_exec_session(container_id)
+            container = await self._get_container(container_id)
+            await self._run(container.stop, timeout=10)
             
             # Update status
             container_status.status = 'stopped'
             container_status.stopped_at = time.time()
+            self._listing_dirty = True
             
-            logger.info(f"✅ Container stopped: {container_id}")
+            logger.info("✅ Container stopped: %s", container_id)
             return True
             
         except Exception as e:
-            logger.error(f"❌ Failed to stop container {container_id}: {e}")
+            logger.error("❌ Failed to stop container %s: %s", container_id, e)
             return False
     
     async def execute_command(self, container_id: str, command: List[str]) -> Dict[str, Any]:
@@ -226,39 +838,119 @@ class ContainerManagementService:
             
             if not self.docker_client:
                 # Simulation mode
-                logger.info(f"🎭 [SIMULATION] Executing: {' '.join(command)}")
+                command_line = joined_command(tuple(command))
+                logger.info("🎭 [SIMULATION] Executing: %s", command_line)
                 return {
-                    'stdout': f"Simulated output for: {' '.join(command)}",
+                    'stdout': f"Simulated output for: {command_line}",
                     'stderr': '',
                     'exitCode': 0
                 }
             
-            logger.info(f"💻 Executing command in {container_id}: {' '.join(command)}")
+            if logger.isEnabledFor(logging.INFO):
+                # Skip joining the command when the record would be dropped
+                logger.info("💻 Executing command in %s: %s", container_id, joined_command(tuple(command)))
             
-            container = self.docker_client.containers.get(container_id)
+            try:
+                # Reuse the container's persistent shell instead of a fresh exec
+                session = await self._get_exec_session(container_id)
+            except Exception as e:
+                logger.warning("⚠️ Exec session unavailable in %s, falling back to exec_run: %s", container_id, e)
+                result = await self._exec_run(container_id, command)
+            else:
+                async with session.lock:
+                    try:
+                        result = await self._run(session.run, command)
+                    except Exception:
+                        # The command may already have run; never replay it
+                        self._close_exec_session(container_id)
+                        raise
             
-            # Execute command
-            exec_result = container.exec_run(
-                cmd=command,
-                stdout=True,
-                stderr=True,
-                stream=False
-            )
+            logger.info("✅ Command executed with exit code: %s", result['exitCode'])
+            return result
+            
+        except Exception as e:
+            logger.error("❌ Command execution failed in %s: %s", container_id, e)
+            return {
+                'stdout': '',
+                'stderr': str(e),
+                'exitCode': 1
+            }
+    
+    async def _exec_run(self, container_id: str, command: List[str]) -> Dict[str, Any]:
+        """Execute a command with a one-off docker exec, decoding output as it streams"""
+        api = self.docker_client.api
+        
+        def run() -> Dict[str, Any]:
+            exec_id = api.exec_create(container_id, command, stdout=True, stderr=True)['Id']
+            
+            # Demuxed frames are decoded per stream, so a large output is never held as one bytes blob
+            stdout_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            stderr_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            stdout, stderr = [], []
+            for out, err in api.exec_start(exec_id, stream=True, demux=True):
+                if out:
+                    stdout.append(stdout_decoder.decode(out))
+                if err:
+                    stderr.append(stderr_decoder.decode(err))
+            stdout.append(stdout_decoder.decode(b'', final=True))
+            stderr.append(stderr_decoder.decode(b'', final=True))
+            
+            return {
+                'stdout': ''.join(stdout),
+                'stderr': ''.join(stderr),
+                'exitCode': api.exec_inspect(exec_id)['ExitCode']
+            }
+        
+        return await self._run(run)
+    
+    async def write_file(self, container_id: str, path: str, content: bytes) -> Dict[str, Any]:
+        """Write a file into a container with a single put_archive call"""
+        try:
+            container_status = self.containers.get(container_id)
+            if not container_status:
+                raise Exception(f"Container {container_id} not found")
+            
+            if container_status.status != 'running':
+                raise Exception(f"Container {container_id} is not running")
             
-            stdout = exec_result.output.decode('utf-8') if exec_result.output else ''
-            stderr = ''
-            exit_code = exec_result.exit_code
+            if not self.docker_client:
+                # Simulation mode
+                logger.info("🎭 [SIMULATION] Writing %s bytes to %s", len(content), path)
+                return {
+                    'stdout': f"Simulated write of {len(content)} bytes to {path}",
+                    'stderr': '',
+                    'exitCode': 0
+                }
             
-            logger.info(f"✅ Command executed with exit code: {exit_code}")
+            logger.info("📝 Writing %s bytes to %s in %s", len(content), path, container_id)
+            
+            container = await self._get_container(container_id)
+            
+            # Relative paths resolve against the container's working directory, as a shell exec would
+            workdir = ((container.attrs or {}).get('Config') or {}).get('WorkingDir') or '/'
+            directory, filename = posixpath.split(posixpath.join(workdir, path))
+            
+            # Build a single-file tar archive in memory
+            archive = io.BytesIO()
+            with tarfile.open(mode='w', fileobj=archive) as tar:
+                tar_info = tarfile.TarInfo(name=filename)
+                tar_info.size = len(content)
+                tar_info.mtime = int(time.time())
+                tar.addfile(tar_info, io.BytesIO(content))
+            
+            written = await self._run(container.put_archive, directory, archive.getvalue())
+            
+            if not written:
+                raise Exception(f"Failed to write {path}")
             
             return {
-                'stdout': stdout,
-                'stderr': stderr,
-                'exitCode': exit_code
+                'stdout': '',
+                'stderr': '',
+                'exitCode': 0
             }
             
         except Exception as e:
-            logger.error(f"❌ Command execution failed in {container_id}: {e}")
+            logger.error("❌ File write failed in %s: %s", container_id, e)
             return {
                 'stdout': '',
                 'stderr': str(e),
@@ -266,7 +958,33 @@ class ContainerManagementService:
             }
     
     async def get_container_status(self, container_id: str) -> Optional[Dict[str, Any]]:
-        """Get container status and stats"""
+        """Get container status and stats, coalescing concurrent and repeated callers"""
+        cached = self._status_cache.get(container_id)
+        if cached and time.monotonic() - cached[0] < STATUS_CACHE_TTL:
+            return cached[1]
+        
+        # Single-flight: concurrent callers share one Docker round trip
+        inflight = self._status_inflight.get(container_id)
+        if inflight:
+            return await asyncio.shield(inflight)
+        
+        inflight = asyncio.get_running_loop().create_future()
+        self._status_inflight[container_id] = inflight
+        try:
+            status = await self._fetch_container_status(container_id)
+        except BaseException:
+            inflight.cancel()
+            raise
+        finally:
+            del self._status_inflight[container_id]
+        
+        if status is not None:
+            self._status_cache[container_id] = (time.monotonic(), status)
+        inflight.set_result(status)
+        return status
+    
+    async def _fetch_container_status(self, container_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch container status and stats from Docker"""
         try:
             container_status = self.containers.get(container_id)
             if not container_status:
@@ -284,40 +1002,46 @@ class ContainerManagementService:
                     'health': container_status.health_status
                 }
             
-            container = self.docker_client.containers.get(container_id)
-            container.reload()
-            
-            # Get basic stats
-            stats = container.stats(stream=False)
-            
-            # Calculate memory usage
-            memory_usage = stats['memory_stats'].get('usage', 0)
+            # Prefer the latest sample from the container's stats stream
+            slot = self._stats_slots.get(container_id)
+            if slot is not None:
+                return {
+                    'status': container_status.status,
+                    'stats': {
+                        'memory': int(self._stats_memory[slot]),
+                        'cpu': float(self._stats_cpu[slot]),
+                        'network': int(self._stats_network[slot])
+                    },
+                    'health': container_status.health_status
+                }
             
-            # Calculate CPU usage
-            cpu_delta = stats['cpu_stats']['cpu_usage']['total_usage'] - \
-                       stats['precpu_stats']['cpu_usage']['total_usage']
-            system_delta = stats['cpu_stats']['system_cpu_usage'] - \
-                          stats['precpu_stats']['system_cpu_usage']
-            cpu_percent = (cpu_delta / system_delta) * 100.0 if system_delta > 0 else 0.0
+            container = await self._get_container(container_id)
             
-            # Calculate network usage
-            network_usage = sum(
-                net['rx_bytes'] + net['tx_bytes'] 
-                for net in stats['networks'].values()
-            ) if 'networks' in stats else 0
+            # The tracked status is kept current by the events stream, so no reload is
+            # needed; only a stats failure for a missing/conflicting container re-reads it
+            try:
+                # One-shot sample skips the daemon's ~1s second read; CPU is diffed
+                # against this container's previous sample instead (0% on the first)
+                stats = await self._run(container.stats, stream=False, one_shot=True)
+                cpu_stats = stats.get('cpu_stats', {})
+                stats['precpu_stats'] = self._cpu_samples.get(container_id, cpu_stats)
+                self._cpu_samples[container_id] = cpu_stats
+            except Exception as e:
+                if getattr(getattr(e, 'response', None), 'status_code', None) not in (404, 409):
+                    raise
+                await self._run(container.reload)
+                container_status.status = DOCKER_STATE_MAP.get(container.status, 'stopped')
+                self._listing_dirty = True
+                stats = {}
             
             return {
-                'status': container.status,
-                'stats': {
-                    'memory': memory_usage,
-                    'cpu': cpu_percent,
-                    'network': network_usage
-                },
-                'health': 'healthy' if container.status == 'running' else 'unhealthy'
+                'status': container_status.status,
+                'stats': summarize_stats(stats),
+                'health': 'healthy' if container_status.status == 'running' else 'unhealthy'
             }
             
         except Exception as e:
-            logger.error(f"❌ Failed to get container status {container_id}: {e}")
+            logger.error("❌ Failed to get container status %s: %s", container_id, e)
             return None
     
     async def remove_container(self, container_id: str) -> bool:
@@ -325,48 +1049,214 @@ class ContainerManagementService:
         try:
             if not self.docker_client:
                 # Simulation mode
-                logger.info(f"🎭 [SIMULATION] Removing container {container_id}")
-                if container_id in self.containers:
-                    del self.containers[container_id]
+                logger.info("🎭 [SIMULATION] Removing container %s", container_id)
+                self._untrack_container(container_id)
                 return True
             
-            logger.info(f"🗑️ Removing real Docker container: {container_id}")
+            logger.info("🗑️ Removing real Docker container: %s", container_id)
             
-            container = self.docker_client.containers.get(container_id)
-            container.remove(force=True)
+            container = await self._get_container(container_id)
+            await self._run(container.remove, force=True)
             
             # Remove from tracking
-            if container_id in self.containers:
-                del self.containers[container_id]
+            self._untrack_container(container_id)
             
-            logger.info(f"✅ Container removed: {container_id}")
+            logger.info("✅ Container removed: %s", container_id)
             return True
             
         except Exception as e:
-            logger.error(f"❌ Failed to remove container {container_id}: {e}")
+            logger.error("❌ Failed to remove container %s: %s", container_id, e)
             return False
     
+    def _close_exec_session(self, container_id: str):
+        """Tear down the persistent shell for a container, if any"""
+        session = self._exec_sessions.pop(container_id, None)
+        if session:
+            session.close()
+    
+    async def _get_exec_session(self, container_id: str) -> ExecSession:
+        """Get or open the persistent shell for a container (LRU-capped)"""
+        session = self._exec_sessions.get(container_id)
+        if session:
+            self._exec_sessions.move_to_end(container_id)
+            return session
+        
+        session = await self._run(ExecSession, self.docker_client, container_id)
+        
+        # A concurrent miss may have opened one first; keep it and close ours
+        existing = self._exec_sessions.get(container_id)
+        if existing:
+            session.close()
+            self._exec_sessions.move_to_end(container_id)
+            return existing
+        self._exec_sessions[container_id] = session
+        
+        while len(self._exec_sessions) > MAX_EXEC_SESSIONS:
+            _, evicted = self._exec_sessions.popitem(last=False)
+            evicted.close()
+        
+        return session
+    
+    def _track_container(self, container_status: ContainerStatus):
+        """Track a container and index it by agent"""
+        self.containers[container_status.container_id] = container_status
+        self.agent_index[container_status.agent_id] = container_status.container_id
+        self._listing_dirty = True
+    
+    def _untrack_container(self, container_id: str):
+        """Drop a container from tracking and from the agent index"""
+        self._close_exec_session(container_id)
+        self._stop_stats_stream(container_id)
+        self._status_cache.pop(container_id, None)
+        self._handles.pop(container_id, None)
+        self._cpu_samples.pop(container_id, None)
+        container_status = self.containers.pop(container_id, None)
+        if container_status:
+            self._listing_dirty = True
+            if self.agent_index.get(container_status.agent_id) == container_id:
+                del self.agent_index[container_status.agent_id]
+    
+    def get_container(self, container_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single tracked container"""
+        status = self.containers.get(container_id)
+        if not status:
+            return None
+        return status.to_dict()
+    
+    def get_agent_container(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        """Get the tracked container for an agent via the agent index (O(1))"""
+        container_id = self.agent_index.get(agent_id)
+        if not container_id:
+            return None
+        return self.get_container(container_id)
+    
     def get_all_containers(self) -> List[Dict[str, Any]]:
-        """Get all tracked containers"""
+        """Get all tracked containers, rebuilt only after a status changed or a container came or went"""
+        if self._listing_dirty:
+            self._listing = [status.to_dict() for status in self.containers.values()]
+            self._listing_dirty = False
+        return self._listing
+    
+    def get_container_summaries(self) -> List[Dict[str, Any]]:
+        """Get the listing fields of all tracked containers without a full field copy"""
         return [
             {
-                'container_id': container_id,
-                **asdict(status)
+                'agent_id': status.agent_id,
+                'container_id': status.container_id,
+                'status': status.status,
+                'created_at': status.created_at,
+                'started_at': status.started_at
             }
-            for container_id, status in self.containers.items()
+            for status in self.containers.values()
         ]
     
+    async def stop_and_remove_container(self, container_id: str) -> bool:
+        """Stop and remove a container"""
+        stopped = await self.stop_container(container_id)
+        removed = await self.remove_container(container_id)
+        return stopped and removed
+    
+    def _set_teardown_result(self, agent_id: str, status: str, container_id: str):
+        self._teardown_results[agent_id] = {
+            'agent_id': agent_id,
+            'container_id': container_id,
+            'status': status,
+            'timestamp': time.time()
+        }
+        self._teardown_results.move_to_end(agent_id)
+        while len(self._teardown_results) > MAX_TEARDOWN_RESULTS:
+            self._teardown_results.popitem(last=False)
+    
+    def queue_teardown(self, agent_id: str) -> Optional[str]:
+        """Queue an agent's container for stop+remove and return its container id"""
+        container_id = self.agent_index.get(agent_id)
+        container_status = self.containers.get(container_id) if container_id else None
+        if not container_status:
+            return None
+        
+        # Repeated requests for an agent already being torn down are no-ops
+        if container_status.status != 'stopping':
+            container_status.status = 'stopping'
+            self._listing_dirty = True
+            self._set_teardown_result(agent_id, 'queued', container_id)
+            self._teardown_queue.put_nowait((agent_id, container_id))
+        
+        # Start workers lazily, like the request queue does
+        self._teardown_workers = [w for w in self._teardown_workers if not w.done()]
+        while len(self._teardown_workers) < min(CLEANUP_CONCURRENCY, self._teardown_queue.qsize()):
+            self._teardown_workers.append(asyncio.create_task(self._teardown_worker()))
+        
+        return container_id
+    
+    def queue_teardown_all(self) -> int:
+        """Queue every tracked agent for teardown"""
+        agent_ids = [status.agent_id for status in self.containers.values()]
+        for agent_id in agent_ids:
+            self.queue_teardown(agent_id)
+        return len(agent_ids)
+    
+    def get_teardown_status(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        """Get the status of a queued teardown"""
+        return self._teardown_results.get(agent_id)
+    
+    async def _teardown_worker(self):
+        """Drain the teardown queue until it is empty"""
+        while not self._teardown_queue.empty():
+            agent_id, container_id = self._teardown_queue.get_nowait()
+            self._set_teardown_result(agent_id, 'processing', container_id)
+            
+            try:
+                removed = await self.stop_and_remove_container(container_id)
+            except Exception as e:
+                logger.error("❌ Teardown failed for agent %s: %s", agent_id, e)
+                removed = False
+            
+            if not removed and container_id in self.containers:
+                # Let a later request retry the teardown
+                self.containers[container_id].status = 'error'
+                self._listing_dirty = True
+            
+            self._set_teardown_result(agent_id, 'completed' if removed else 'failed', container_id)
+            self._teardown_queue.task_done()
+    
     async def cleanup_all_containers(self):
         """Cleanup all containers"""
         logger.info("🧹 Cleaning up all agent containers...")
         
+        # Bound fan-out so a large cleanup doesn't flood dockerd
+        semaphore = asyncio.Semaphore(CLEANUP_CONCURRENCY)
+        
+        # With Docker, containers are only stopped here and then removed by a single prune
+        teardown = self.stop_container if self.docker_client else self.stop_and_remove_container
+        
+        async def cleanup(container_id: str):
+            async with semaphore:
+                return await teardown(container_id)
+        
         container_ids = list(self.containers.keys())
-        for container_id in container_ids:
+        results = await asyncio.gather(
+            *(cleanup(container_id) for container_id in container_ids),
+            return_exceptions=True
+        )
+        
+        for container_id, result in zip(container_ids, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to cleanup container %s: %s", container_id, result)
+        
+        if self.docker_client:
             try:
-                await self.stop_container(container_id)
-                await self.remove_container(container_id)
+                # Match the bare key so claimed warm-pool containers are pruned too
+                await self._run(
+                    self.docker_client.containers.prune,
+                    filters={"label": MANAGED_LABEL}
+                )
             except Exception as e:
-                logger.error(f"Failed to cleanup container {container_id}: {e}")
+                logger.error("❌ Failed to prune agent containers: %s", e)
+                return
+            
+            for container_id, result in zip(container_ids, results):
+                if result is True:
+                    self._untrack_container(container_id)
         
         logger.info("✅ Container cleanup completed")
 
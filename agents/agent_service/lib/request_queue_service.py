@@ -5,12 +5,15 @@ Request Queue Service - Manages API rate limiting and request queuing
 import asyncio
 import logging
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator
 from datetime import datetime, timedelta
 import json
 
 logger = logging.getLogger("request_queue_service")
 
+# How long a computed queue status is reused for repeated polls
+QUEUE_STATUS_TTL = 0.25  # seconds
+
 class RequestQueueService:
     """Production-grade request queuing with intelligent rate limiting"""
     
@@ -22,6 +25,9 @@ class RequestQueueService:
         self.request_history = []
         self.is_processing = False
         self.processing_requests = set()  # Track currently processing requests
+        self._status_cache: Optional[tuple] = None  # (computed_at, status)
+        self._result_events: Dict[str, asyncio.Event] = {}  # request_id -> completion event
+        self._result_waiters: Dict[str, int] = {}  # request_id -> subscriber count
         logger.info(f"🚦 Request Queue initialized: {max_concurrent_requests} concurrent, {requests_per_minute} RPM")
     
     async def add_request(self, request_type: str, user_input: str, context: Dict[str, Any] = None) -> str:
@@ -175,6 +181,11 @@ class RequestQueueService:
             "timestamp": datetime.utcnow().isoformat(),
             "status": "completed" if "error" not in result else "failed"
         }
+        
+        # Wake any subscribers waiting on this request
+        event = self._result_events.pop(request_id, None)
+        if event:
+            event.set()
     
     def get_result(self, request_id: str) -> Optional[Dict[str, Any]]:
         """Get result for a request ID"""
@@ -182,9 +193,53 @@ class RequestQueueService:
             return self._results.get(request_id)
         return None
     
-    def get_queue_status(self) -> Dict[str, Any]:
-        """Get current queue status"""
+    def _status_event(self, request_id: str, result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if result:
+            return {
+                "request_id": request_id,
+                "status": result["status"],
+                "timestamp": result["timestamp"],
+                "has_result": True
+            }
         return {
+            "request_id": request_id,
+            "status": "processing",
+            "has_result": False
+        }
+    
+    async def subscribe(self, request_id: str, timeout: float = 180) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the current status of a request, then its completion once stored"""
+        result = self.get_result(request_id)
+        if result:
+            yield self._status_event(request_id, result)
+            return
+        
+        # Register before the first yield so a result stored while the
+        # consumer handles that frame still wakes this subscriber
+        event = self._result_events.setdefault(request_id, asyncio.Event())
+        self._result_waiters[request_id] = self._result_waiters.get(request_id, 0) + 1
+        try:
+            yield self._status_event(request_id, None)
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            yield {**self._status_event(request_id, None), "timeout": True}
+            return
+        finally:
+            # Drop the event once its last subscriber is gone
+            self._result_waiters[request_id] -= 1
+            if not self._result_waiters[request_id]:
+                del self._result_waiters[request_id]
+                self._result_events.pop(request_id, None)
+        
+        yield self._status_event(request_id, self.get_result(request_id))
+    
+    def get_queue_status(self) -> Dict[str, Any]:
+        """Get current queue status, reusing a snapshot younger than QUEUE_STATUS_TTL"""
+        now = time.monotonic()
+        if self._status_cache and now - self._status_cache[0] < QUEUE_STATUS_TTL:
+            return self._status_cache[1]
+        
+        status = {
             "queue_size": self.queue.qsize(),
             "active_requests": self.active_requests,
             "is_processing": self.is_processing,
@@ -192,6 +247,8 @@ class RequestQueueService:
             "rate_limit": self.requests_per_minute,
             "can_accept_requests": self._can_make_request()
         }
+        self._status_cache = (now, status)
+        return status
 
 # Singleton instance
 request_queue_service = RequestQueueService(
@@ -6,11 +6,13 @@ import traceback
 import time
 import docker
 import subprocess
+import anyio.to_thread
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict
 from typing import Dict, Any, Optional, List, Union, Annotated
 from pydantic import BaseModel, Field
 from fastapi import FastAPI, HTTPException, Body, Request, Depends, Path, Query, status, APIRouter
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
@@ -35,12 +37,15 @@ from lib.container_management_service import container_service
 
 # Initialize production agent endpoints
 from endpoints.production_agent import router as production_router
+from endpoints.queue_status import request_event_stream
 
 # Configuration from environment
 AGENT_PORT = int(os.getenv("AGENT_PORT", "8001"))
 DEBUG_MODE = os.getenv("DEBUG", "false").lower() == "true"
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",")
 API_VERSION = "v1"
+# Threads for sync endpoints/dependencies (anyio) and run_in_executor calls
+THREADPOOL_SIZE = int(os.getenv("GENESIS_THREADPOOL", "64"))
 
 # Define API models
 class AgentInput(BaseModel):
@@ -126,6 +131,13 @@ async def lifespan(app: FastAPI):
         # Startup logic - use plain text for Windows compatibility
         logger.info("Starting GenesisOS Agent Service")
         
+        # Size the threadpools explicitly instead of relying on library defaults
+        anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=THREADPOOL_SIZE, thread_name_prefix="genesis")
+        )
+        logger.info(f"🧵 Threadpool size: {THREADPOOL_SIZE}")
+        
         # Initialize services with enhanced setup
         try:
             # Initialize container service first
@@ -169,12 +181,13 @@ async def lifespan(app: FastAPI):
         await agent_manager.close()
         await gemini_service.close()
         await voice_service.close()
+        await container_service.close()
     except Exception as e:
         logger.error(f"Error in lifespan: {e}")
         raise
 
 # Create FastAPI app
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Configure CORS with more specific settings
 app.add_middleware(
@@ -787,6 +800,15 @@ async def get_request_status(request_id: str):
             content={"success": False, "error": str(e)}
         )
 
+@app.get("/request-stream/{request_id}")
+async def stream_request_status(request_id: str):
+    """Stream status of specific request until it completes"""
+    return StreamingResponse(
+        request_event_stream(request_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
 # SIMULATION REMOVED - NOW IN ORCHESTRATOR
 # Simulation endpoints have been moved to orchestrator service
 # FastAPI now focuses ONLY on AI execution
@@ -1262,5 +1284,9 @@ async def mcp_health():
 
 # Main entry point
 if __name__ == "__main__":
+    import platform
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=AGENT_PORT, reload=True)
\ No newline at end of file
+    
+    # uvloop is not available on Windows
+    loop = "asyncio" if platform.system() == "Windows" else "uvloop"
+    uvicorn.run("main:app", host="0.0.0.0", port=AGENT_PORT, reload=True, loop=loop, http="httptools")
\ No newline at end of file
@@ -16,6 +16,7 @@ def run_agent_service():
     host = os.getenv("AGENT_HOST", "0.0.0.0")
     reload = os.getenv("RELOAD", "true").lower() == "true"
     debug = os.getenv("DEBUG", "false").lower() == "true"
+    workers = int(os.getenv("GENESIS_WORKERS", "1"))
 
     # Check if running on Windows to avoid encoding issues
     is_windows = platform.system() == "Windows"
@@ -45,11 +46,19 @@ def run_agent_service():
         command = [
             python_executable, "-m", "uvicorn", "main:app",
             "--host", host,
-            "--port", str(port)
+            "--port", str(port),
+            "--http", "httptools"
         ]
 
+        # uvloop is not available on Windows
+        if not is_windows:
+            command.extend(["--loop", "uvloop"])
+
         if reload:
             command.append("--reload")
+        elif workers > 1:
+            # uvicorn can't combine --reload with multiple workers
+            command.extend(["--workers", str(workers)])
 
         if debug:
             command.append("--log-level=debug")
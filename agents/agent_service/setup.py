@@ -37,6 +37,8 @@ def setup_environment():
                 f.write("AGENT_MEMORY_ENABLED=true\n")
                 f.write("VOICE_ENABLED=true\n")
                 f.write("DEBUG=true\n")
+                f.write("GENESIS_THREADPOOL=64\n")
+                f.write("GENESIS_WORKERS=1\n")
             print("⚠️ .env file created with placeholder values. Please update with your actual API keys!")
 
     # Check if virtual environment exists